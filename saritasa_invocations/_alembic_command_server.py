@@ -0,0 +1,103 @@
+"""Server which runs alembic commands sent over unix socket.
+
+Commands are run in one long-lived process with alembic command API, so
+interpreter startup and imports of alembic, `env.py` dependencies and models
+are paid once for all commands.
+
+Script is copied into project and run by its python interpreter, so it
+should depend only on standard library and alembic.
+
+Protocol: client sends json line with `args` of `alembic` (or with `stop`
+to stop server), server streams output of command and sends NUL byte with
+exit code at the end.
+
+"""
+
+import contextlib
+import json
+import os
+import pathlib
+import socket
+import sys
+import traceback
+import typing
+
+
+def main(socket_path: str) -> None:
+    """Serve alembic commands until stop request is received."""
+    # Script is run from project root like `alembic`
+    sys.path.insert(0, str(pathlib.Path.cwd()))
+
+    import alembic.command
+    import alembic.config  # noqa: F401
+
+    path = pathlib.Path(socket_path)
+    path.unlink(missing_ok=True)
+    with socket.socket(socket.AF_UNIX) as server:
+        server.bind(socket_path)
+        server.listen()
+        try:
+            while True:
+                connection, _ = server.accept()
+                line = connection.makefile().readline()
+                # Client only checks that server is running
+                if not line:
+                    connection.close()
+                    continue
+                request = json.loads(line)
+                if request.get("stop"):
+                    connection.close()
+                    break
+                _run_command(connection, request["args"])
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def _run_command(connection: socket.socket, args: list[str]) -> int:
+    """Run alembic command and stream its output to connection."""
+    from alembic.config import CommandLine, Config
+
+    class ServerCommandLine(CommandLine):
+        """Command line which prints to current `sys.stdout`."""
+
+        def run_cmd(self, config: Config, options: typing.Any) -> None:
+            # By default config prints to `sys.stdout` of server start
+            config.stdout = sys.stdout
+            super().run_cmd(config, options)
+
+    output = connection.makefile(mode="w", buffering=1, errors="replace")
+    exit_code = 0
+    stdin = sys.stdin
+    with (
+        open(os.devnull) as devnull,  # noqa: PTH123
+        contextlib.redirect_stdout(output),
+        contextlib.redirect_stderr(output),
+    ):
+        sys.stdin = devnull
+        try:
+            ServerCommandLine(prog="alembic").main(argv=args)
+        except SystemExit as error:
+            exit_code = _get_exit_code(error)
+        except Exception:  # noqa: BLE001
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            sys.stdin = stdin
+    output.write(f"\0{exit_code}")
+    output.close()
+    connection.close()
+    return exit_code
+
+
+def _get_exit_code(error: SystemExit) -> int:
+    """Get exit code of `SystemExit` the same way as interpreter does."""
+    if error.code is None:
+        return 0
+    if isinstance(error.code, int):
+        return error.code
+    sys.stderr.write(f"{error.code}\n")
+    return 1
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
@@ -0,0 +1,146 @@
+"""Client of command servers which run commands without interpreter restart.
+
+Server is script copied into project, which is run by its python interpreter
+and listens on unix socket.
+
+Protocol: client sends json line with `args` of command (or with `stop`
+to stop server, empty line is used to check that server is running), server
+streams output of command and sends NUL byte with exit code at the end.
+
+"""
+
+import codecs
+import collections.abc
+import json
+import pathlib
+import shutil
+import socket
+import sys
+import time
+import typing
+
+import invoke
+
+from . import printing
+
+_CHUNK_SIZE = 64 * 1024
+
+
+def copy_script(source: pathlib.Path, destination: str) -> None:
+    """Copy packaged script into project."""
+    script_path = pathlib.Path(destination)
+    script_path.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(source, script_path)
+
+
+def is_running(socket_path: str) -> bool:
+    """Check that command server accepts connections."""
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+    if not pathlib.Path(socket_path).exists():
+        return False
+    with socket.socket(socket.AF_UNIX) as connection:
+        try:
+            connection.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def send(
+    socket_path: str,
+    request: dict[str, typing.Any],
+) -> socket.socket:
+    """Open connection to command server and send request to it."""
+    connection = socket.socket(socket.AF_UNIX)
+    connection.connect(socket_path)
+    connection.sendall(json.dumps(request).encode() + b"\n")
+    return connection
+
+
+def stop(socket_path: str) -> None:
+    """Send stop request to command server."""
+    send(socket_path, request={"stop": True}).close()
+
+
+def start(
+    run_server: collections.abc.Callable[..., typing.Any],
+    socket_path: str,
+    timeout: float,
+) -> invoke.runners.Promise | None:
+    """Start command server in background and wait until it's ready.
+
+    `run_server` should run server with passed kwargs of `context.run`.
+    `None` is returned if server failed to start.
+
+    """
+    promise = run_server(
+        asynchronous=True,
+        pty=False,
+        in_stream=False,
+    )
+    deadline = time.monotonic() + timeout
+    while not is_running(socket_path):
+        if promise.runner.process_is_finished:
+            try:
+                promise.join()
+            except invoke.Failure as error:
+                printing.print_warn(
+                    "Command server failed to start:\n"
+                    f"{error.result.stderr.strip()}",
+                )
+            return None
+        if time.monotonic() > deadline:
+            promise.runner.kill()
+            raise invoke.Exit(
+                code=1,
+                message=f"Command server is not ready in {timeout}s",
+            )
+        time.sleep(0.1)
+    return promise
+
+
+def run_command(
+    context: invoke.Context,
+    socket_path: str,
+    command: str,
+    args: collections.abc.Sequence[str],
+    hide: bool = False,
+) -> invoke.runners.Result:
+    """Run command via command server and stream its output.
+
+    `command` is used for echo and result, while `args` are sent to server.
+
+    """
+    if context.config.run.echo:
+        sys.stdout.write(
+            context.config.run.echo_format.format(
+                command=f"{command} (command server)",
+            )
+            + "\n",
+        )
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    output = []
+    exit_code = ""
+    is_finished = False
+    with send(socket_path, request={"args": list(args)}) as connection:
+        while chunk := connection.recv(_CHUNK_SIZE):
+            text = decoder.decode(chunk)
+            if is_finished:
+                exit_code += text
+                continue
+            # Output is followed by NUL byte and exit code
+            text, separator, exit_code = text.partition("\0")
+            is_finished = bool(separator)
+            output.append(text)
+            if not hide:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+    result = invoke.runners.Result(
+        stdout="".join(output),
+        command=command,
+        exited=int(exit_code or 1),
+    )
+    if result.failed:
+        raise invoke.UnexpectedExit(result)
+    return result
@@ -55,6 +55,11 @@ class PythonSettings:
     entry: str = "python"
     docker_service: str = "web"
     docker_service_params: str = "--rm"
+    reuse_docker_service: bool = False
+    docker_service_container_name: str = "{project_name}-{service}-python"
+    docker_service_container_params: str = "--detach"
+    docker_service_container_command: str = "sleep infinity"
+    docker_service_container_timeout: float = 60.0
     mypy_entry: str = "-m mypy"
     pytest_entry: str = "-m pytest"
 
@@ -93,15 +98,58 @@ class DjangoSettings:
     migrate_command: str = "migrate"
     makemessages_params: str = "--all --ignore venv"
     compilemessages_params: str = ""
+    messages_source_patterns: collections.abc.Sequence[str] = (
+        "*.py",
+        "*.html",
+        "*.txt",
+        "*.js",
+    )
+    project_ignored_dirs: collections.abc.Sequence[str] = (
+        "venv",
+        ".venv",
+        "node_modules",
+        ".git",
+        ".tmp",
+    )
+    messages_cache_file: str = ".tmp/recompile-messages.json"
+    compilemessages_jobs: int = 0
+    urls_patterns: collections.abc.Sequence[str] = ("urls.py", "urls/*.py")
+    show_urls_cache_file: str = ".tmp/show-urls.json"
     verbose_email_name: str = "Email address"
     default_superuser_email: str = "root@localhost"
     verbose_username_name: str = "Username"
     default_superuser_username: str = "root"
     verbose_password_name: str = "Password"  # noqa: S105
     default_superuser_password: str = "root"  # noqa: S105
+    createsuperuser_credentials_mode: typing.Literal["prompt", "env"] = (
+        "prompt"
+    )
+    resetdb_bootstrap: bool = False
+    bootstrap_script: str = ".tmp/django_bootstrap.py"
+    profile_script: str = ".tmp/django_profiler.py"
+    profile_dir: str = ".tmp/profiles"
+    profile_sort: str = "cumulative"
+    profile_limit: int = 30
+    migrations_patterns: collections.abc.Sequence[str] = ("migrations/*.py",)
+    test_db_template_script: str = ".tmp/django_test_db_template.py"
     shell_command: str = "shell_plus --ipython"
     path_to_remote_config_file: str = "/workspace/app/config/settings/.env"
     manage_file_path: str = "./manage.py"
+    wait_for_database_timeout: float = 60.0
+    wait_for_database_marker_file: str = ".tmp/.db-is-ready"
+    wait_for_database_marker_lifetime: float = 10.0
+    use_command_server: bool = True
+    command_server_socket: str = ".tmp/django-command-server.sock"
+    command_server_script: str = ".tmp/django_command_server.py"
+    command_server_start_timeout: float = 60.0
+    command_server_excluded_commands: collections.abc.Sequence[str] = (
+        "shell",
+        "shell_plus",
+        "dbshell",
+        "runserver",
+        "runserver_plus",
+        "makemigrations",
+    )
     settings_path: str = "config.settings.local"
     app_boilerplate_link: str | None = None
     apps_path: str = "apps"
@@ -149,12 +197,35 @@ class AlembicSettings:
     """Settings for alembic module."""
 
     connect_attempts: int = 10
+    wait_for_database_timeout: float = 60.0
     command: str = "-m alembic"
+    use_command_server: bool = False
+    command_server_socket: str = ".tmp/alembic-command-server.sock"
+    command_server_script: str = ".tmp/alembic_command_server.py"
+    command_server_start_timeout: float = 60.0
     migrations_folder: str = "db/migrations/versions"
+    revision_index_file: str = ".tmp/alembic-revisions.json"
+    schema_baseline_folder: str = ".tmp/schema-baselines"
+    schema_baseline_dump_params: str = (
+        "--schema-only --no-owner --no-privileges"
+    )
+    version_table: str = "alembic_version"
+    query_command: str = (
+        "psql "
+        "--no-psqlrc "
+        "--tuples-only "
+        "--no-align "
+        "--dbname={dbname} "
+        "--host={host} "
+        "--port={port} "
+        "--username={username} "
+        "--command={query}"
+    )
     adjust_messages: collections.abc.Sequence[str] = (
         "# ### commands auto generated by Alembic - please adjust! ###",
         "# ### end Alembic commands ###",
     )
+    adjust_messages_cache_file: str = ".tmp/alembic-adjust-messages.json"
     db_config_mapping: dict[str, str] = dataclasses.field(
         default_factory=lambda: {
             "dbname": "rds_db_name",
@@ -175,9 +246,18 @@ class CruftSettings:
 
 @dataclasses.dataclass
 class DBSettings:
-    """Settings for db module."""
+    """Settings for db module.
+
+    `credentials_mode` defines how password is passed to db commands:
+
+    - `prompt`: answer to password prompt (requires pty)
+    - `env`: pass via `PGPASSWORD` env variable
+    - `passfile`: pass via temporary file from `PGPASSFILE` env variable
+
+    """
 
     password_pattern: str = "Password.*"  # noqa: S105
+    credentials_mode: typing.Literal["prompt", "env", "passfile"] = "prompt"
     load_dump_command: str = (
         "psql "
         "{additional_params} "
@@ -189,6 +269,40 @@ class DBSettings:
     )
     dump_filename: str = "local-db-dump.sql"
     load_additional_params: str = "--quiet"
+    decompress_commands: dict[str, str] = dataclasses.field(
+        default_factory=lambda: {
+            ".gz": "gzip --decompress --stdout {file}",
+            ".zst": "zstd --decompress --stdout {file}",
+            ".xz": "xz --decompress --stdout {file}",
+        },
+    )
+    restore_command: str = (
+        "pg_restore "
+        "{additional_params} "
+        "--dbname={dbname} "
+        "--host={host} "
+        "--port={port} "
+        "--username={username} "
+        "{file}"
+    )
+    restore_additional_params: str = "--exit-on-error"
+    catalog_command: str = "pg_restore {additional_params} {file}"
+    verify_dump_checksum: bool = False
+    fast_load_settings: dict[str, str] = dataclasses.field(
+        default_factory=lambda: {
+            "synchronous_commit": "off",
+            "maintenance_work_mem": "256MB",
+        },
+    )
+    fast_load_single_transaction: bool = True
+    analyze_command: str = (
+        "psql "
+        "--dbname={dbname} "
+        "--host={host} "
+        "--port={port} "
+        "--username={username} "
+        "--command=ANALYZE"
+    )
     dump_command: str = (
         "pg_dump "
         "{additional_params} "
@@ -204,6 +318,32 @@ class DBSettings:
     dump_exclude_table: str = ""
     dump_exclude_table_data: str = ""
     dump_exclude_extension: str = ""
+    dump_exclude_table_data_size: str = ""
+    dump_exclude_table_data_patterns: collections.abc.Sequence[str] = ()
+    table_sizes_command: str = (
+        "psql "
+        "--no-psqlrc "
+        "--tuples-only "
+        "--no-align "
+        "--dbname={dbname} "
+        "--host={host} "
+        "--port={port} "
+        "--username={username} "
+        "--command={query}"
+    )
+    subset_command: str = (
+        "psql "
+        "--no-psqlrc "
+        "--quiet "
+        "--tuples-only "
+        "--no-align "
+        "--dbname={dbname} "
+        "--host={host} "
+        "--port={port} "
+        "--username={username} "
+        "--file={script} "
+        "--output={file}"
+    )
 
 
 # This mapping should not be filled manually. You just need create an instance
@@ -241,6 +381,9 @@ class K8SDBSettings:
     exec_command: str = (
         "kubectl exec -ti --namespace {db_pod_namespace} $({db_pod})"
     )
+    non_interactive_exec_command: str = (
+        "kubectl exec -i --namespace {db_pod_namespace} $({db_pod})"
+    )
     dump_dir: str = "tmp"
     dump_command: str = (
         "pg_dump "
@@ -257,6 +400,73 @@ class K8SDBSettings:
     dump_exclude_table: str = ""
     dump_exclude_table_data: str = ""
     dump_exclude_extension: str = ""
+    dump_exclude_table_data_size: str = ""
+    dump_exclude_table_data_patterns: collections.abc.Sequence[str] = ()
+    table_sizes_command: str = (
+        "psql "
+        "--no-psqlrc "
+        "--tuples-only "
+        "--no-align "
+        "--dbname={dbname} "
+        "--host={host} "
+        "--port={port} "
+        "--username={username} "
+        "--command={query}"
+    )
+    subset_command: str = (
+        "psql "
+        "--no-psqlrc "
+        "--quiet "
+        "--tuples-only "
+        "--no-align "
+        "--dbname={dbname} "
+        "--host={host} "
+        "--port={port} "
+        "--username={username} "
+        "--file={script} "
+        "--output={file}"
+    )
+    stream_dump_command: str = (
+        "pg_dump "
+        "{additional_params} "
+        "--encoding=UTF8 "
+        "--dbname={dbname} "
+        "--host={host} "
+        "--port={port} "
+        "--username={username}"
+    )
+    sync_tables_command: str = (
+        "psql "
+        "--no-psqlrc "
+        "--quiet "
+        "--tuples-only "
+        "--no-align "
+        "--dbname={dbname} "
+        "--host={host} "
+        "--port={port} "
+        "--username={username} "
+        "--file={script}"
+    )
+    dump_checksum_command: str = "sh -c 'wc -c < {file} && sha256sum {file}'"
+    dump_size_command: str = "stat -c %s {file}"
+    free_disk_command: str = "df -Pk {dir}"
+    dump_stats_file: str = ".tmp/db-k8s-dump-stats.json"
+    dump_stats_history_size: int = 20
+    estimate_dump_size_ratio: float = 0.5
+    port_forward_local_port: str = "15432"
+    port_forward_timeout: float = 10.0
+    port_forward_dump_jobs: int = 4
+    port_forward_dump_command: str = (
+        "pg_dump "
+        "{additional_params} "
+        "--format=directory "
+        "--jobs={jobs} "
+        "--dbname={dbname} "
+        "--host={host} "
+        "--port={port} "
+        "--username={username} "
+        "--file={file}"
+    )
 
 
 @dataclasses.dataclass(frozen=True)
@@ -0,0 +1,75 @@
+"""Run sequence of Django management commands in one process.
+
+Django is set up once and all commands are run with `call_command`, so
+imports, settings and app registry loading are paid just once.
+
+Script is copied into project and run by its python interpreter, so it
+should depend only on standard library and Django.
+
+Plan is passed as json argument: `steps` are run one by one and sequence
+stops on first failed step (unless it's marked as `optional`). Step marked
+as `background` is started in thread once previous steps are finished and
+runs at the same time with following steps. Each step is a dict with `args`
+of `manage.py`.
+
+"""
+
+import concurrent.futures
+import json
+import pathlib
+import sys
+import traceback
+import typing
+
+
+def main(plan_json: str) -> int:
+    """Run commands from plan and return exit code."""
+    # Script is run from project root like `manage.py`
+    sys.path.insert(0, str(pathlib.Path.cwd()))
+
+    import django
+
+    django.setup()
+
+    plan = json.loads(plan_json)
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        background = []
+        is_successful = True
+        for step in plan.get("steps", ()):
+            if step.get("background"):
+                background.append(executor.submit(_run_command, step))
+                continue
+            if not _run_command(step):
+                is_successful = False
+                break
+        for future in background:
+            is_successful = future.result() and is_successful
+    return 0 if is_successful else 1
+
+
+def _run_command(step: dict[str, typing.Any]) -> bool:
+    """Run management command and return whether it was successful."""
+    from django.core.management import call_command
+    from django.core.management.base import CommandError
+    from django.db import connections
+
+    args = step["args"]
+    sys.stdout.write(f"manage.py {' '.join(args)}\n")
+    sys.stdout.flush()
+    try:
+        call_command(*args)
+    except CommandError as error:
+        sys.stderr.write(f"CommandError: {error}\n")
+        return bool(step.get("optional"))
+    except Exception:  # noqa: BLE001
+        traceback.print_exc()
+        return bool(step.get("optional"))
+    finally:
+        # Connections are per thread, so close them to not block
+        # dropping of databases by other steps
+        connections.close_all()
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1]))
@@ -0,0 +1,102 @@
+"""Server which runs Django management commands sent over unix socket.
+
+Django is set up once, then each command is run in forked process, so it
+doesn't pay for imports and setup, but can't affect following commands.
+
+Script is copied into project and run by its python interpreter, so it
+should depend only on standard library and Django.
+
+Protocol: client sends json line with `args` of `manage.py` (or with `stop`
+to stop server), server streams output of command and sends NUL byte with
+exit code at the end.
+
+"""
+
+import contextlib
+import json
+import os
+import pathlib
+import signal
+import socket
+import sys
+import traceback
+
+
+def main(socket_path: str) -> None:
+    """Serve management commands until stop request is received."""
+    # Script is run from project root like `manage.py`
+    sys.path.insert(0, str(pathlib.Path.cwd()))
+
+    import django
+
+    django.setup()
+
+    from django.db import connections
+
+    path = pathlib.Path(socket_path)
+    path.unlink(missing_ok=True)
+    # Forked processes are reaped automatically
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    with socket.socket(socket.AF_UNIX) as server:
+        server.bind(socket_path)
+        server.listen()
+        try:
+            while True:
+                connection, _ = server.accept()
+                line = connection.makefile().readline()
+                # Client only checks that server is running
+                if not line:
+                    connection.close()
+                    continue
+                request = json.loads(line)
+                if request.get("stop"):
+                    connection.close()
+                    break
+                # Forked process should open its own db connections
+                connections.close_all()
+                if os.fork():
+                    connection.close()
+                    continue
+                server.close()
+                os._exit(_run_command(connection, request["args"]))
+        finally:
+            path.unlink(missing_ok=True)
+
+
+def _run_command(connection: socket.socket, args: list[str]) -> int:
+    """Run management command and stream its output to connection."""
+    from django.core.management import execute_from_command_line
+
+    output = connection.makefile(mode="w", buffering=1, errors="replace")
+    exit_code = 0
+    with (
+        open(os.devnull) as stdin,  # noqa: PTH123
+        contextlib.redirect_stdout(output),
+        contextlib.redirect_stderr(output),
+    ):
+        sys.stdin = stdin
+        try:
+            execute_from_command_line(["manage.py", *args])
+        except SystemExit as error:
+            exit_code = _get_exit_code(error)
+        except Exception:  # noqa: BLE001
+            traceback.print_exc()
+            exit_code = 1
+    output.write(f"\0{exit_code}")
+    output.close()
+    connection.close()
+    return exit_code
+
+
+def _get_exit_code(error: SystemExit) -> int:
+    """Get exit code of `SystemExit` the same way as interpreter does."""
+    if error.code is None:
+        return 0
+    if isinstance(error.code, int):
+        return error.code
+    sys.stderr.write(f"{error.code}\n")
+    return 1
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
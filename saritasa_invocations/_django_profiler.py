@@ -0,0 +1,162 @@
+"""Run Django management command under cProfile.
+
+Besides python profile, SQL queries of all db connections are captured via
+`execute_wrapper`: their count and total time are reported along with the
+slowest ones.
+
+Script is copied into project and run by its python interpreter, so it
+should depend only on standard library and Django.
+
+Usage: `script <output prefix> <sort> <limit> <manage.py args>`. Profile is
+saved into `<output prefix>.pstats` and report into `<output prefix>.txt`.
+
+"""
+
+import collections
+import cProfile
+import io
+import pathlib
+import pstats
+import sys
+import threading
+import time
+import traceback
+import typing
+
+_QUERY_MAX_LENGTH = 200
+
+
+class QueryStats:
+    """Collect count and duration of executed SQL queries."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.count = 0
+        self.duration = 0.0
+        self.queries: collections.defaultdict[str, list[float]] = (
+            collections.defaultdict(lambda: [0, 0.0])
+        )
+
+    def __call__(
+        self,
+        execute: typing.Callable[..., typing.Any],
+        sql: str,
+        params: typing.Any,
+        many: bool,
+        context: dict[str, typing.Any],
+    ) -> typing.Any:
+        """Measure duration of query (`execute_wrapper` interface)."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            with self.lock:
+                self.count += 1
+                self.duration += duration
+                query = self.queries[sql]
+                query[0] += 1
+                query[1] += duration
+
+    def install(self) -> None:
+        """Attach wrapper to every db connection once it's created."""
+        from django.db.backends.signals import connection_created
+
+        connection_created.connect(self._on_connection_created, weak=False)
+
+    def _on_connection_created(
+        self,
+        sender: typing.Any,
+        connection: typing.Any,
+        **kwargs,
+    ) -> None:
+        """Attach wrapper to connection if it's not attached yet."""
+        if self not in connection.execute_wrappers:
+            connection.execute_wrappers.append(self)
+
+    def report(self, limit: int) -> str:
+        """Format summary of queries with the slowest ones."""
+        lines = [
+            f"SQL queries: {self.count}, total time: {self.duration:.3f}s",
+        ]
+        slowest = sorted(
+            self.queries.items(),
+            key=lambda item: item[1][1],
+            reverse=True,
+        )[:limit]
+        if slowest:
+            lines.append("")
+            lines.append(f"{'count':>8} {'total, s':>10}  query")
+        for sql, (count, duration) in slowest:
+            query = " ".join(sql.split())
+            if len(query) > _QUERY_MAX_LENGTH:
+                query = f"{query[:_QUERY_MAX_LENGTH]}..."
+            lines.append(f"{count:>8} {duration:>10.3f}  {query}")
+        return "\n".join(lines) + "\n"
+
+
+def main(output_prefix: str, sort: str, limit: int, args: list[str]) -> int:
+    """Profile management command, write report and return exit code."""
+    # Script is run from project root like `manage.py`
+    sys.path.insert(0, str(pathlib.Path.cwd()))
+
+    import django
+
+    django.setup()
+
+    from django.core.management import execute_from_command_line
+
+    query_stats = QueryStats()
+    query_stats.install()
+    profiler = cProfile.Profile()
+    exit_code = 0
+    start = time.perf_counter()
+    try:
+        profiler.runcall(execute_from_command_line, ["manage.py", *args])
+    except SystemExit as error:
+        exit_code = _get_exit_code(error)
+    except Exception:  # noqa: BLE001
+        traceback.print_exc()
+        exit_code = 1
+    duration = time.perf_counter() - start
+
+    report = io.StringIO()
+    report.write(f"Command: manage.py {' '.join(args)}\n")
+    report.write(f"Exit code: {exit_code}, total time: {duration:.3f}s\n")
+    report.write(query_stats.report(limit))
+    report.write("\n")
+    pstats.Stats(profiler, stream=report).sort_stats(sort).print_stats(
+        limit,
+    )
+
+    output = pathlib.Path(output_prefix)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(output.with_suffix(".pstats"))
+    output.with_suffix(".txt").write_text(report.getvalue())
+    sys.stdout.write(
+        f"\n{query_stats.report(limit)}\n"
+        f"Profile: {output.with_suffix('.pstats')}\n"
+        f"Report: {output.with_suffix('.txt')}\n",
+    )
+    return exit_code
+
+
+def _get_exit_code(error: SystemExit) -> int:
+    """Get exit code of `SystemExit` the same way as interpreter does."""
+    if error.code is None:
+        return 0
+    if isinstance(error.code, int):
+        return error.code
+    sys.stderr.write(f"{error.code}\n")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(
+        main(
+            output_prefix=sys.argv[1],
+            sort=sys.argv[2],
+            limit=int(sys.argv[3]),
+            args=sys.argv[4:],
+        ),
+    )
@@ -0,0 +1,80 @@
+"""Build test database template from migrations and clone it per worker.
+
+Template is created by Django test runner machinery (so it's migrated the
+same way as test database) and renamed to `<test db>_template_<hash>`,
+where hash is hash of migration files. Stale templates of test database are
+dropped. Then test database is cloned from template with
+`CREATE DATABASE ... TEMPLATE` for each suffix, for example, `_gw0` for
+pytest-xdist workers.
+
+Script is copied into project and run by its python interpreter, so it
+should depend only on standard library and Django. Only PostgreSQL is
+supported.
+
+Usage: `script <migrations hash> [<suffix> ...]`, empty suffix is used if
+none is specified.
+
+"""
+
+import pathlib
+import sys
+
+
+def main(migrations_hash: str, suffixes: list[str]) -> int:
+    """Build template if it's missing, clone it and return exit code."""
+    # Script is run from project root like `manage.py`
+    sys.path.insert(0, str(pathlib.Path.cwd()))
+
+    import django
+
+    django.setup()
+
+    from django.db import connection
+
+    if connection.vendor != "postgresql":
+        sys.stderr.write(
+            f"Test database cloning isn't supported by {connection.vendor}\n",
+        )
+        return 1
+    test_name = connection.creation._get_test_db_name()
+    template_prefix = f"{test_name}_template_"
+    template = f"{template_prefix}{migrations_hash}"
+    quote_name = connection.ops.quote_name
+    with connection.creation._nodb_cursor() as cursor:
+        cursor.execute("SELECT datname FROM pg_database")
+        templates = {
+            name
+            for (name,) in cursor.fetchall()
+            if name.startswith(template_prefix)
+        }
+    if template not in templates:
+        sys.stdout.write(f"Building test database template {template}\n")
+        connection.creation.create_test_db(
+            verbosity=1,
+            autoclobber=True,
+            serialize=False,
+            keepdb=False,
+        )
+        connection.close()
+        with connection.creation._nodb_cursor() as cursor:
+            cursor.execute(
+                f"ALTER DATABASE {quote_name(test_name)} "
+                f"RENAME TO {quote_name(template)}",
+            )
+    with connection.creation._nodb_cursor() as cursor:
+        for stale_template in sorted(templates - {template}):
+            sys.stdout.write(f"Dropping stale template {stale_template}\n")
+            cursor.execute(f"DROP DATABASE {quote_name(stale_template)}")
+        for suffix in suffixes or [""]:
+            clone = f"{test_name}{suffix}"
+            sys.stdout.write(f"Cloning {template} to {clone}\n")
+            cursor.execute(f"DROP DATABASE IF EXISTS {quote_name(clone)}")
+            cursor.execute(
+                f"CREATE DATABASE {quote_name(clone)} "
+                f"TEMPLATE {quote_name(template)}",
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(migrations_hash=sys.argv[1], suffixes=sys.argv[2:]))
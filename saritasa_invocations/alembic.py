@@ -1,9 +1,39 @@
+import ast
+import atexit
+import collections.abc
+import concurrent.futures
+import contextlib
+import functools
+import hashlib
+import json
 import pathlib
+import re
+import shlex
+import socket
 import time
+import typing
 
 import invoke
 
-from . import _config, db, db_k8s, docker, k8s, printing, python
+from . import (
+    _command_server,
+    _config,
+    db,
+    db_k8s,
+    docker,
+    k8s,
+    printing,
+    python,
+)
+
+_COMMAND_SERVER_SCRIPT = (
+    pathlib.Path(__file__).parent / "_alembic_command_server.py"
+)
+# Module level assignments of revision identifiers in migration file
+_REVISION_HEADER_REGEX = re.compile(
+    r"^(?P<name>revision|down_revision)\s*(?::[^=\n]*)?=\s*(?P<value>.+?)\s*$",
+    flags=re.MULTILINE,
+)
 
 
 @invoke.task
@@ -12,31 +42,43 @@ def wait_for_database(context: invoke.Context) -> None:
 
     Function called just once during subsequent calls of alembic commands.
 
+    Database from `.env` file is probed right from invoke with PostgreSQL
+    startup handshake using exponential backoff with jitter, then alembic is
+    run once to check connection. If db settings can't be loaded or db host
+    can't be resolved (for example, it's docker service name), alembic is
+    run up to `connect_attempts` times with the same backoff.
+
     """
     if hasattr(wait_for_database, "_called"):
         return
     docker.up(context)
     printing.print_success("Wait for database connection")
     config = _config.Config.from_context(context)
+    if _probe_database(context):
+        attempts = 1
+        delays: collections.abc.Iterator[float] = iter(())
+    else:
+        attempts = config.alembic.connect_attempts
+        delays = db.iterate_backoff_delays(
+            config.alembic.wait_for_database_timeout,
+        )
     with _config.context_override(
         context,
         run={
             "echo": False,
             "hide": "out",
         },
-    ) as context:
-        for _ in range(config.alembic.connect_attempts - 1):
+    ) as hidden_context:
+        for _ in range(attempts - 1):
             try:
                 # Doing it manually to avoid loop
-                python.run(
-                    context,
-                    command=f"{config.alembic.command} current",
-                )
+                _run_alembic(hidden_context, command="current")
                 wait_for_database._called = True  # type: ignore
                 return
             except invoke.UnexpectedExit:  # noqa: PERF203
-                time.sleep(1)
-                continue
+                if (delay := next(delays, None)) is None:
+                    break
+                time.sleep(delay)
 
     with _config.context_override(
         context,
@@ -44,33 +86,132 @@ def wait_for_database(context: invoke.Context) -> None:
             "echo": True,
             "hide": None,
         },
-    ) as context:
+    ) as visible_context:
         try:
             # Do it one more time but without hiding the terminal output
-            python.run(
-                context,
-                command=f"{config.alembic.command} current",
-            )
+            _run_alembic(visible_context, command="current")
             wait_for_database._called = True  # type: ignore
         except invoke.UnexpectedExit as error:
             printing.print_error(
-                "Failed to connect to db, "
-                f"after {config.alembic.connect_attempts} attempts",
+                f"Failed to connect to db, after {attempts} attempts",
             )
             raise invoke.Exit(code=1) from error
 
 
+def _probe_database(context: invoke.Context) -> bool:
+    """Wait until db from `.env` file accepts connections.
+
+    Return `False` if db settings can't be loaded or db host can't be
+    resolved, so probe can't be used.
+
+    """
+    config = _config.Config.from_context(context)
+    try:
+        import decouple
+    except ImportError:
+        return False
+    try:
+        db_settings = _load_local_env_db_settings(context, file=".env")
+        db.wait_for_connection(
+            host=db_settings["host"],
+            port=db_settings["port"],
+            dbname=db_settings["dbname"],
+            username=db_settings["username"],
+            timeout=config.alembic.wait_for_database_timeout,
+        )
+    except (KeyError, OSError, decouple.UndefinedValueError):
+        return False
+    return True
+
+
 @invoke.task
 def run(context: invoke.Context, command: str) -> None:
-    """Execute alembic command."""
+    """Execute alembic command.
+
+    If `use_command_server` is set, in local python env command is run by
+    command server (see `_run_alembic`).
+
+    """
     wait_for_database(context)
+    _run_alembic(context, command=command)
+
+
+def _run_alembic(
+    context: invoke.Context,
+    command: str,
+) -> invoke.runners.Result | None:
+    """Run alembic command.
+
+    If `use_command_server` is set and python env is local, alembic command
+    server is started on first call and kept till the end of invocation, so
+    following commands are run in the same process with alembic command API
+    (imports of `env.py` dependencies and models are done once).
+
+    """
     config = _config.Config.from_context(context)
-    python.run(
+    if _start_command_server(context):
+        return _command_server.run_command(
+            context,
+            socket_path=config.alembic.command_server_socket,
+            command=f"alembic {command}",
+            args=shlex.split(command),
+            hide=bool(context.config.run.hide),
+        )
+    return python.run(
         context,
         command=f"{config.alembic.command} {command}",
     )
 
 
+def _start_command_server(context: invoke.Context) -> bool:
+    """Start command server unless it's running and return if it's usable.
+
+    Server is stopped on exit of invoke.
+
+    """
+    config = _config.Config.from_context(context)
+    if (
+        not config.alembic.use_command_server
+        or python.get_python_env() != python.PythonEnv.LOCAL
+        or not hasattr(socket, "AF_UNIX")
+        or hasattr(_start_command_server, "_failed")
+    ):
+        return False
+    socket_path = config.alembic.command_server_socket
+    if _command_server.is_running(socket_path):
+        return True
+    _command_server.copy_script(
+        _COMMAND_SERVER_SCRIPT,
+        config.alembic.command_server_script,
+    )
+    promise = _command_server.start(
+        run_server=functools.partial(
+            python.run_local_python,
+            context,
+            command=f"{config.alembic.command_server_script} {socket_path}",
+            hide=None,
+            echo=False,
+        ),
+        socket_path=socket_path,
+        timeout=config.alembic.command_server_start_timeout,
+    )
+    if promise is None:
+        _start_command_server._failed = True  # type: ignore
+        return False
+    atexit.register(_stop_command_server, socket_path, promise)
+    return True
+
+
+def _stop_command_server(
+    socket_path: str,
+    promise: invoke.runners.Promise,
+) -> None:
+    """Stop command server started by invocation."""
+    if _command_server.is_running(socket_path):
+        _command_server.stop(socket_path)
+    promise.join()
+
+
 @invoke.task
 def autogenerate(
     context: invoke.Context,
@@ -92,11 +233,17 @@ def autogenerate(
             ),
         )
     printing.print_success("Autogenerate migrations")
-    config = _config.Config.from_context(context)
-    rev_id = str(
-        len(_get_migration_files_paths(config.alembic.migrations_folder)) + 1,
-    )
-    rev_id = rev_id.rjust(4, "0")
+    revision_index = get_revision_index(context)
+    heads = get_heads(revision_index)
+    if len(heads) > 1:
+        raise invoke.Exit(
+            code=1,
+            message=(
+                f"Multiple heads found: {', '.join(sorted(heads))}. Please, "
+                'merge them with `inv alembic.run "merge heads -m ..."`.'
+            ),
+        )
+    rev_id = get_next_rev_id(revision_index)
     command = (
         f'revision --autogenerate --message "{message}" --rev-id={rev_id}'
     )
@@ -153,23 +300,55 @@ def check_for_migrations(
 def check_for_adjust_messages(
     context: invoke.Context,
 ) -> None:
-    """Check migration files for adjust messages."""
+    """Check migration files for adjust messages.
+
+    Files are scanned in parallel with one pattern matching all messages.
+    Found messages are cached in `adjust_messages_cache_file` by
+    modification time and hash of file, so unchanged files are not scanned
+    again.
+
+    """
     printing.print_success("Checking migration files for adjust messages")
     config = _config.Config.from_context(context)
-    files_to_clean = []
-    for filepath in _get_migration_files_paths(
-        config.alembic.migrations_folder,
-    ):
-        with pathlib.Path(filepath).open() as migration_file:
-            file_text = migration_file.read()
-            for adjust_message in config.alembic.adjust_messages:
-                if adjust_message in file_text:
-                    files_to_clean.append(str(filepath))
-                    break
-
-    if files_to_clean:
-        log_files_msg = "\n\t".join(files_to_clean)
-        log_messages = "\n".join(config.alembic.adjust_messages)
+    messages = list(config.alembic.adjust_messages)
+    if not messages:
+        return
+    pattern = re.compile("|".join(map(re.escape, messages)))
+    cache_path = pathlib.Path(config.alembic.adjust_messages_cache_file)
+    cache: dict[str, typing.Any] = {}
+    if cache_path.exists():
+        with contextlib.suppress(ValueError):
+            cache = json.loads(cache_path.read_text())
+    cached_files = (
+        cache.get("files", {}) if cache.get("messages") == messages else {}
+    )
+    paths = _get_migration_files_paths(config.alembic.migrations_folder)
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        files = dict(
+            zip(
+                (path.as_posix() for path in paths),
+                executor.map(
+                    functools.partial(
+                        _scan_for_adjust_messages,
+                        pattern=pattern,
+                        cached_files=cached_files,
+                    ),
+                    paths,
+                ),
+                strict=True,
+            ),
+        )
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps({"messages": messages, "files": files}))
+
+    found_messages = [
+        f"{path}:{line}: {message}"
+        for path, scanned_file in sorted(files.items())
+        for line, message in scanned_file["hits"]
+    ]
+    if found_messages:
+        log_files_msg = "\n\t".join(found_messages)
+        log_messages = "\n".join(messages)
         printing.print_error(
             f"Adjust messages found in these migration files:\n"
             f"\t{log_files_msg}\n"
@@ -179,6 +358,272 @@ def check_for_adjust_messages(
         raise invoke.Exit(code=1)
 
 
+def _scan_for_adjust_messages(
+    path: pathlib.Path,
+    pattern: re.Pattern[str],
+    cached_files: dict[str, dict[str, typing.Any]],
+) -> dict[str, typing.Any]:
+    """Find adjust messages with their line numbers in migration file.
+
+    Cached result is used if file has the same modification time or hash.
+
+    """
+    cached_file = cached_files.get(path.as_posix())
+    mtime = path.stat().st_mtime
+    if cached_file and cached_file["mtime"] == mtime:
+        return cached_file
+    content = path.read_bytes()
+    sha256 = hashlib.sha256(content).hexdigest()
+    if cached_file and cached_file["sha256"] == sha256:
+        return {**cached_file, "mtime": mtime}
+    text = content.decode(errors="replace")
+    return {
+        "mtime": mtime,
+        "sha256": sha256,
+        "hits": [
+            [text.count("\n", 0, match.start()) + 1, match.group()]
+            for match in pattern.finditer(text)
+        ],
+    }
+
+
+@invoke.task
+def check_pending_revisions(
+    context: invoke.Context,
+    env_file_path: str = ".env",
+) -> None:
+    """Check if db is not upgraded to heads of migrations.
+
+    Heads are taken from revision index and compared with versions stored in
+    db, so alembic is not run.
+
+    """
+    config = _config.Config.from_context(context)
+    heads = get_heads(get_revision_index(context))
+    versions = set(
+        _query_local_db(
+            context,
+            query=f"SELECT version_num FROM {config.alembic.version_table}",  # noqa: S608
+            env_file_path=env_file_path,
+        ),
+    )
+    if versions == heads:
+        printing.print_success("There are no pending revisions")
+        return
+    printing.print_error(
+        "There are pending revisions: db is at "
+        f"{', '.join(sorted(versions)) or 'base'}, heads are "
+        f"{', '.join(sorted(heads)) or 'base'}",
+    )
+    raise invoke.Exit(code=1)
+
+
+@invoke.task
+def generate_schema_baseline(
+    context: invoke.Context,
+    env_file_path: str = ".env",
+) -> str:
+    """Generate schema baseline of local db upgraded to head.
+
+    Baseline is schema-only dump with stamp of alembic version, which is
+    saved into `schema_baseline_folder` with hash of migration files in name.
+
+    """
+    config = _config.Config.from_context(context)
+    upgrade(context)
+    file = _get_schema_baseline_path(context)
+    printing.print_success(f"Generating schema baseline {file}")
+    file.parent.mkdir(parents=True, exist_ok=True)
+    db_settings = _load_local_env_db_settings(context, file=env_file_path)
+    password = db_settings.pop("password")
+    db.run_with_password(
+        context,
+        command=config.db.dump_command.format(
+            file=file,
+            additional_params=config.alembic.schema_baseline_dump_params,
+            **db_settings,
+        ),
+        password=password,
+    )
+    versions = _query_local_db(
+        context,
+        query=f"SELECT version_num FROM {config.alembic.version_table}",  # noqa: S608
+        env_file_path=env_file_path,
+    )
+    with file.open(mode="a") as baseline_file:
+        # pg_dump clears search_path in dump
+        baseline_file.write(
+            "\n-- Stamp of alembic version\nRESET search_path;\n",
+        )
+        baseline_file.writelines(
+            f"INSERT INTO {config.alembic.version_table} (version_num) "  # noqa: S608
+            f"VALUES ('{version}');\n"
+            for version in versions
+        )
+    return str(file)
+
+
+@invoke.task
+def apply_schema_baseline(
+    context: invoke.Context,
+    env_file_path: str = ".env",
+) -> None:
+    """Set up empty local db from schema baseline instead of migrations.
+
+    If there is no baseline for current migrations, db is upgraded from base
+    and baseline is generated for next runs.
+
+    """
+    wait_for_database(context)
+    tables_count = _query_local_db(
+        context,
+        query=(
+            "SELECT count(*) FROM pg_tables "
+            "WHERE schemaname NOT IN ('pg_catalog', 'information_schema')"
+        ),
+        env_file_path=env_file_path,
+    )
+    if tables_count != ["0"]:
+        raise invoke.Exit(
+            code=1,
+            message="Schema baseline can be applied only to empty db.",
+        )
+    file = _get_schema_baseline_path(context)
+    if not file.exists():
+        printing.print_warn(
+            f"Schema baseline {file} is not found, upgrading db from base.",
+        )
+        generate_schema_baseline(context, env_file_path=env_file_path)
+        return
+    printing.print_success(f"Applying schema baseline {file}")
+    db.load_db_dump(
+        context,
+        file=str(file),
+        additional_params="--quiet --single-transaction --set ON_ERROR_STOP=1",
+        verify_manifest=False,
+        **_load_local_env_db_settings(context, file=env_file_path),
+    )
+
+
+def _get_schema_baseline_path(context: invoke.Context) -> pathlib.Path:
+    """Get path of schema baseline for current migration files."""
+    config = _config.Config.from_context(context)
+    migrations_hash = hashlib.sha256()
+    for path in sorted(
+        _get_migration_files_paths(config.alembic.migrations_folder),
+    ):
+        migrations_hash.update(path.name.encode())
+        migrations_hash.update(path.read_bytes())
+    return (
+        pathlib.Path(config.alembic.schema_baseline_folder)
+        / f"schema-{migrations_hash.hexdigest()[:12]}.sql"
+    )
+
+
+def _query_local_db(
+    context: invoke.Context,
+    query: str,
+    env_file_path: str,
+) -> list[str]:
+    """Run query in local db and return lines of its output."""
+    config = _config.Config.from_context(context)
+    db_settings = _load_local_env_db_settings(context, file=env_file_path)
+    password = db_settings.pop("password")
+    result = db.run_with_password(
+        context,
+        command=config.alembic.query_command.format(
+            query=shlex.quote(query),
+            **db_settings,
+        ),
+        password=password,
+        echo=False,
+        hide="out",
+    )
+    # Output could contain password prompt in `prompt` credentials mode
+    return [
+        line.strip()
+        for line in (result.stdout if result else "").splitlines()
+        if line.strip() and not re.match(config.db.password_pattern, line)
+    ]
+
+
+def get_revision_index(
+    context: invoke.Context,
+) -> dict[str, dict[str, typing.Any]]:
+    """Get revision headers of migration files by path.
+
+    Headers (`revision` and `down_revision`) are parsed only for files which
+    changed since last call, others are taken from `revision_index_file` by
+    modification time.
+
+    """
+    config = _config.Config.from_context(context)
+    index_path = pathlib.Path(config.alembic.revision_index_file)
+    cached_index: dict[str, dict[str, typing.Any]] = {}
+    if index_path.exists():
+        with contextlib.suppress(ValueError):
+            cached_index = json.loads(index_path.read_text())
+    index = {}
+    for path in _get_migration_files_paths(config.alembic.migrations_folder):
+        key = path.as_posix()
+        mtime = path.stat().st_mtime
+        entry = cached_index.get(key)
+        if not entry or entry["mtime"] != mtime:
+            entry = {"mtime": mtime, **_parse_revision_headers(path)}
+        index[key] = entry
+    if index != cached_index:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        index_path.write_text(json.dumps(index, indent=2))
+    return index
+
+
+def get_heads(
+    revision_index: dict[str, dict[str, typing.Any]],
+) -> set[str]:
+    """Get revisions which are not revised by other revisions."""
+    revisions = {
+        entry["revision"]
+        for entry in revision_index.values()
+        if entry["revision"]
+    }
+    down_revisions = {
+        down_revision
+        for entry in revision_index.values()
+        for down_revision in entry["down_revisions"]
+    }
+    return revisions - down_revisions
+
+
+def get_next_rev_id(revision_index: dict[str, dict[str, typing.Any]]) -> str:
+    """Get next numeric revision id after max existing one."""
+    numeric_revisions = [
+        int(entry["revision"])
+        for entry in revision_index.values()
+        if entry["revision"] and entry["revision"].isdigit()
+    ]
+    return str(max(numeric_revisions, default=0) + 1).rjust(4, "0")
+
+
+def _parse_revision_headers(path: pathlib.Path) -> dict[str, typing.Any]:
+    """Parse `revision` and `down_revision` of migration file."""
+    headers: dict[str, typing.Any] = {}
+    for match in _REVISION_HEADER_REGEX.finditer(path.read_text()):
+        if match["name"] in headers:
+            continue
+        try:
+            headers[match["name"]] = ast.literal_eval(match["value"])
+        except (ValueError, SyntaxError):
+            headers[match["name"]] = None
+    down_revision = headers.get("down_revision")
+    if isinstance(down_revision, str):
+        down_revision = (down_revision,)
+    revision = headers.get("revision")
+    return {
+        "revision": revision if isinstance(revision, str) else None,
+        "down_revisions": list(down_revision or ()),
+    }
+
+
 def _get_migration_files_paths(
     migrations_folder: str,
 ) -> tuple[pathlib.Path, ...]:
@@ -196,13 +641,45 @@ def load_db_dump(
     file: str = "",
     env_file_path: str = ".env",
     reset_db: bool = True,
+    fast: bool = False,
+    jobs: int = 0,
 ) -> None:
-    """Reset db and load db dump."""
+    """Reset db and load db dump.
+
+    Dump is checked against its manifest before db is reset.
+
+    """
+    db.verify_dump_manifest(context, file=file)
     if reset_db:
         downgrade(context)
     db.load_db_dump(
         context,
         file=file,
+        fast=fast,
+        jobs=jobs,
+        verify_manifest=False,
+        **_load_local_env_db_settings(context, file=env_file_path),
+    )
+
+
+@invoke.task(iterable=["tables", "schemas", "sections"])
+def load_db_dump_selectively(
+    context: invoke.Context,
+    file: str = "",
+    tables: collections.abc.Sequence[str] | None = None,
+    schemas: collections.abc.Sequence[str] | None = None,
+    sections: collections.abc.Sequence[str] | None = None,
+    jobs: int = 1,
+    env_file_path: str = ".env",
+) -> None:
+    """Load chosen tables, schemas or sections of db dump without reset."""
+    db.load_db_dump_selectively(
+        context,
+        file=file,
+        tables=tables,
+        schemas=schemas,
+        sections=sections,
+        jobs=jobs,
         **_load_local_env_db_settings(context, file=env_file_path),
     )
 
@@ -225,9 +702,22 @@ def backup_local_db(
 def backup_remote_db(
     context: invoke.Context,
     file: str = "",
+    jobs: int = 0,
 ) -> str:
-    """Make dump of remote db and download it."""
+    """Make dump of remote db and download it.
+
+    If `jobs` is set, db is dumped locally in directory format with `jobs`
+    parallel workers via port-forward to db pod.
+
+    """
     settings = _load_remote_env_db_settings(context)
+    if jobs:
+        return db_k8s.create_dump_via_port_forward(
+            context,
+            file=file,
+            jobs=jobs,
+            **settings,
+        )
     db_k8s.create_dump(
         context,
         file=file,
@@ -243,10 +733,47 @@ def backup_remote_db(
 def load_remote_db(
     context: invoke.Context,
     file: str = "",
+    jobs: int = 0,
+    env_file_path: str = ".env",
+) -> None:
+    """Make dump of remote db, download it and apply it.
+
+    Local db is reset while remote db is dumped and dump is loaded while it
+    arrives. If `jobs` is set, dump is made and restored with `jobs` parallel
+    workers.
+
+    """
+    db_k8s.load_dump_with_pipeline(
+        context,
+        remote_db_settings=_load_remote_env_db_settings(context),
+        local_db_settings=_load_local_env_db_settings(
+            context,
+            file=env_file_path,
+        ),
+        reset_local_db=lambda: downgrade(context),
+        file=file,
+        jobs=jobs,
+    )
+
+
+@invoke.task(iterable=["tables"])
+def sync_remote_tables(
+    context: invoke.Context,
+    tables: collections.abc.Sequence[str],
+    where: str = "",
+    env_file_path: str = ".env",
+    disable_triggers: bool = False,
 ) -> None:
-    """Make dump of remote db, download it and apply it."""
-    file = backup_remote_db(context, file=file)
-    load_db_dump(context, file=file)
+    """Stream data of tables from remote db into local db."""
+    local_settings = _load_local_env_db_settings(context, file=env_file_path)
+    db_k8s.sync_tables(
+        context,
+        tables=tables,
+        where=where,
+        disable_triggers=disable_triggers,
+        **{f"local_{name}": value for name, value in local_settings.items()},
+        **_load_remote_env_db_settings(context),
+    )
 
 
 def _load_local_env_db_settings(
@@ -1,6 +1,352 @@
+import codecs
+import collections
+import collections.abc
+import concurrent.futures
+import contextlib
+import dataclasses
+import datetime
+import hashlib
+import json
+import os
+import pathlib
+import random
+import re
+import shlex
+import shutil
+import socket
+import struct
+import tempfile
+import time
+import typing
+
 import invoke
+import rich.table
+import rich.text
+
+from . import _config, printing, system
+
+_TABLE_SIZES_QUERY_TEMPLATE = (
+    "SELECT "
+    "format('%I.%I', ns.nspname, cls.relname), "
+    "pg_total_relation_size(cls.oid), "
+    "pg_size_pretty(pg_total_relation_size(cls.oid)), "
+    "coalesce(pg_total_relation_size(cls.oid) > pg_size_bytes({threshold}), "
+    "false) "
+    "FROM pg_class AS cls "
+    "JOIN pg_namespace AS ns ON ns.oid = cls.relnamespace "
+    "WHERE cls.relkind = 'r' "
+    "AND ns.nspname NOT IN ('pg_catalog', 'information_schema') "
+    "ORDER BY 2 DESC"
+)
+_TABLE_SIZE_REGEX = re.compile(
+    r"^(?P<table>.+)\|(?P<size>\d+)\|(?P<pretty_size>[^|]+)\|(?P<too_big>[tf])\r?$",
+    flags=re.MULTILINE,
+)
+# Number of biggest tables which data is kept to show in size report
+_SIZE_REPORT_KEPT_TABLES = 10
+
+_DEFAULT_PORT = 5432
+# Version 3.0 of PostgreSQL frontend/backend protocol
+_PROTOCOL_VERSION = 196608
+# Error which server responds with while it's starting up or shutting down
+_CANNOT_CONNECT_NOW_ERROR = b"C57P03\0"
+_WAIT_FOR_CONNECTION_MIN_DELAY = 0.1
+_WAIT_FOR_CONNECTION_MAX_DELAY = 2.0
+
+# Magic bytes of custom format dump
+_ARCHIVE_MAGIC = b"PGDMP"
+# Size of chunks in which dump which is still being written is read
+_GROWING_DUMP_CHUNK_SIZE = 1024 * 1024
+# pg_dump puts such comment before each object of plain dump
+_TOC_HEADER_REGEX = re.compile(
+    rb"^-- (?:Data for )?Name: (?P<name>.*); Type: (?P<type>[^;]+); "
+    rb"Schema: (?P<schema>[^;]*);",
+)
+_POST_DATA_TABLE_REGEX = re.compile(
+    rb"^(?:CREATE (?:UNIQUE )?INDEX \S+ ON (?:ONLY )?|ALTER TABLE (?:ONLY )?)"
+    rb"(?P<table>[^\s(]+)",
+    flags=re.MULTILINE,
+)
+_DATA_TYPES = frozenset(
+    (
+        b"TABLE DATA",
+        b"SEQUENCE SET",
+        b"BLOBS",
+        b"LARGE OBJECTS",
+    ),
+)
+_POST_DATA_TYPES = frozenset(
+    (
+        b"INDEX",
+        b"INDEX ATTACH",
+        b"CONSTRAINT",
+        b"CHECK CONSTRAINT",
+        b"FK CONSTRAINT",
+        b"TRIGGER",
+        b"EVENT TRIGGER",
+        b"RULE",
+        b"POLICY",
+        b"ROW SECURITY",
+        b"STATISTICS",
+        b"MATERIALIZED VIEW DATA",
+        b"PUBLICATION",
+        b"PUBLICATION TABLE",
+        b"PUBLICATION TABLES IN SCHEMA",
+        b"SUBSCRIPTION",
+        b"SUBSCRIPTION TABLE",
+    ),
+)
+# These objects belong to single table, so they can be built concurrently
+_PARALLEL_POST_DATA_TYPES = frozenset(
+    (
+        b"INDEX",
+        b"CONSTRAINT",
+        b"CHECK CONSTRAINT",
+    ),
+)
+
+_DUMP_SECTIONS = ("pre-data", "data", "post-data")
+_CATALOG_SUFFIX = ".catalog.json"
+_COPY_TABLE_REGEX = re.compile(
+    rb'^COPY (?P<table>(?:"(?:[^"]|"")*"|[^\s"])+) .*FROM stdin;\n$',
+)
+_MANIFEST_SUFFIX = ".manifest.json"
+_PG_DUMP_VERSION_REGEX = re.compile(
+    r"^[-;]+\s+Dumped by pg_dump version:? (?P<version>.+)$",
+    flags=re.MULTILINE,
+)
+# Same as `_TOC_HEADER_REGEX`, but for search in whole script
+_SCRIPT_HEADER_REGEX = re.compile(
+    r"^-- Name: (?P<name>.*); Type: (?P<type>[^;]+); "
+    r"Schema: (?P<schema>[^;]*);",
+    flags=re.MULTILINE,
+)
+# Matches `id; tableoid oid` prefix of `pg_restore --list` entries
+_CATALOG_LINE_REGEX = re.compile(r"^\d+; \d+ \d+ (?P<description>.*)$")
+_IDENTIFIER = r'(?:"(?:[^"]|"")+"|[\w$]+)'
+_QUALIFIED_NAME_REGEX = re.compile(
+    rf"^(?:(?P<schema>{_IDENTIFIER})\.)?(?P<name>{_IDENTIFIER})$",
+)
+# Statements in schema-only dump which reference table object belongs to
+_OBJECT_TABLE_REGEX = re.compile(
+    rf"^(?:"
+    rf"CREATE (?:UNLOGGED |FOREIGN )?TABLE |"
+    rf"CREATE (?:UNIQUE )?INDEX {_IDENTIFIER} ON (?:ONLY )?|"
+    rf"CREATE (?:CONSTRAINT )?TRIGGER .* ON |"
+    rf"CREATE POLICY {_IDENTIFIER} ON |"
+    rf"CREATE RULE {_IDENTIFIER} AS\s+ON \w+ TO |"
+    rf"ALTER TABLE (?:ONLY )?|"
+    rf"ALTER SEQUENCE {_IDENTIFIER}\.{_IDENTIFIER} OWNED BY "
+    rf")(?P<schema>{_IDENTIFIER})\.(?P<name>{_IDENTIFIER})",
+    flags=re.MULTILINE,
+)
+
+# Script is executed by psql in a single transaction, so all sampled rows and
+# rows pulled in through foreign keys come from the same snapshot. Selected
+# rows are collected in temp tables, which are dropped on rollback.
+_SUBSET_SCRIPT_TEMPLATE = """
+\\set ON_ERROR_STOP on
+BEGIN ISOLATION LEVEL REPEATABLE READ;
+
+CREATE TEMP TABLE _subset_tables (
+    relid regclass PRIMARY KEY,
+    tmp_name text NOT NULL
+);
+
+DO $subset$
+DECLARE
+    root_table regclass;
+    fk record;
+    changed boolean := true;
+    inserted bigint;
+BEGIN
+    FOREACH root_table IN ARRAY ARRAY[{root_tables}]::regclass[] LOOP
+        INSERT INTO _subset_tables
+        VALUES (root_table, '_subset_' || root_table::oid)
+        ON CONFLICT DO NOTHING;
+        IF FOUND THEN
+            EXECUTE format(
+                'CREATE TEMP TABLE %I AS SELECT * FROM %s %s %s',
+                '_subset_' || root_table::oid,
+                root_table,
+                {sample_clause},
+                {limit_clause}
+            );
+        END IF;
+    END LOOP;
+
+    -- Pull in referenced rows until there is nothing left to add
+    WHILE changed LOOP
+        changed := false;
+        FOR fk IN
+            SELECT
+                con.confrelid,
+                child.tmp_name AS child_tmp,
+                '_subset_' || con.confrelid::oid AS parent_tmp,
+                cols.child_columns,
+                cols.parent_columns,
+                cols.existing_columns
+            FROM pg_constraint AS con
+            JOIN _subset_tables AS child ON child.relid = con.conrelid
+            CROSS JOIN LATERAL (
+                SELECT
+                    string_agg(
+                        format('c.%I', child_att.attname), ', ' ORDER BY k.ord
+                    ) AS child_columns,
+                    string_agg(
+                        format('p.%I', parent_att.attname), ', ' ORDER BY k.ord
+                    ) AS parent_columns,
+                    string_agg(
+                        format('x.%I', parent_att.attname), ', ' ORDER BY k.ord
+                    ) AS existing_columns
+                FROM unnest(con.conkey, con.confkey)
+                    WITH ORDINALITY AS k(child_attnum, parent_attnum, ord)
+                JOIN pg_attribute AS child_att
+                    ON child_att.attrelid = con.conrelid
+                    AND child_att.attnum = k.child_attnum
+                JOIN pg_attribute AS parent_att
+                    ON parent_att.attrelid = con.confrelid
+                    AND parent_att.attnum = k.parent_attnum
+            ) AS cols
+            WHERE con.contype = 'f'
+        LOOP
+            INSERT INTO _subset_tables
+            VALUES (fk.confrelid, fk.parent_tmp)
+            ON CONFLICT DO NOTHING;
+            IF FOUND THEN
+                EXECUTE format(
+                    'CREATE TEMP TABLE %I AS SELECT * FROM %s WITH NO DATA',
+                    fk.parent_tmp,
+                    fk.confrelid::regclass
+                );
+                changed := true;
+            END IF;
+            EXECUTE format(
+                'INSERT INTO %1$I SELECT p.* FROM %2$s AS p '
+                || 'WHERE (%3$s) IN (SELECT %4$s FROM %5$I AS c) '
+                || 'AND NOT EXISTS '
+                || '(SELECT FROM %1$I AS x WHERE (%6$s) = (%3$s))',
+                fk.parent_tmp,
+                fk.confrelid::regclass,
+                fk.parent_columns,
+                fk.child_columns,
+                fk.child_tmp,
+                fk.existing_columns
+            );
+            GET DIAGNOSTICS inserted = ROW_COUNT;
+            changed := changed OR inserted > 0;
+        END LOOP;
+    END LOOP;
+END
+$subset$;
+
+-- Output data in the same format as plain pg_dump does
+SELECT
+    format(
+        'SELECT %L',
+        format(
+            'COPY %I.%I (%s) FROM stdin;',
+            ns.nspname,
+            cls.relname,
+            cols.names
+        )
+    ),
+    format('COPY (SELECT %s FROM %I) TO STDOUT', cols.names, subset.tmp_name),
+    format('SELECT %L', '\\.')
+FROM _subset_tables AS subset
+JOIN pg_class AS cls ON cls.oid = subset.relid
+JOIN pg_namespace AS ns ON ns.oid = cls.relnamespace
+CROSS JOIN LATERAL (
+    SELECT
+        string_agg(quote_ident(att.attname), ', ' ORDER BY att.attnum) AS names
+    FROM pg_attribute AS att
+    WHERE att.attrelid = subset.relid
+        AND att.attnum > 0
+        AND NOT att.attisdropped
+        AND att.attgenerated = ''
+) AS cols
+ORDER BY ns.nspname, cls.relname
+\\gexec
+
+SELECT format(
+    'SELECT pg_catalog.setval(%L, %s, true);',
+    format('%I.%I', schemaname, sequencename),
+    last_value
+)
+FROM pg_sequences
+WHERE last_value IS NOT NULL;
+
+ROLLBACK;
+"""
+
+_SYNC_TABLES_SCRIPT_TEMPLATE = """
+\\set ON_ERROR_STOP on
+BEGIN ISOLATION LEVEL REPEATABLE READ READ ONLY;
+
+-- Output is a script which is applied in single transaction, so if output
+-- is interrupted, COMMIT is never reached and nothing is changed
+SELECT 'BEGIN;';
+
+SELECT format(
+    'TRUNCATE %s;',
+    string_agg(format('%I.%I', ns.nspname, cls.relname), ', ')
+)
+FROM pg_class AS cls
+JOIN pg_namespace AS ns ON ns.oid = cls.relnamespace
+WHERE cls.oid = ANY(ARRAY[{tables}]::regclass[]);
+
+SELECT
+    format(
+        'SELECT %L',
+        format(
+            'COPY %I.%I (%s) FROM stdin;',
+            ns.nspname,
+            cls.relname,
+            cols.names
+        )
+    ),
+    format(
+        'COPY (SELECT %s FROM %I.%I WHERE %s) TO STDOUT',
+        cols.names,
+        ns.nspname,
+        cls.relname,
+        {where}
+    ),
+    format('SELECT %L', '\\.')
+FROM unnest(ARRAY[{tables}]::regclass[]) WITH ORDINALITY
+    AS synced (relid, position)
+JOIN pg_class AS cls ON cls.oid = synced.relid
+JOIN pg_namespace AS ns ON ns.oid = cls.relnamespace
+CROSS JOIN LATERAL (
+    SELECT
+        string_agg(quote_ident(att.attname), ', ' ORDER BY att.attnum) AS names
+    FROM pg_attribute AS att
+    WHERE att.attrelid = synced.relid
+        AND att.attnum > 0
+        AND NOT att.attisdropped
+        AND att.attgenerated = ''
+) AS cols
+ORDER BY synced.position
+\\gexec
+
+-- Sync sequences owned by tables, so new rows don't conflict with synced ones
+SELECT format(
+    'SELECT pg_catalog.setval(%L, %s, true);',
+    format('%I.%I', seq.schemaname, seq.sequencename),
+    seq.last_value
+)
+FROM pg_sequences AS seq
+JOIN pg_depend AS dep
+    ON dep.objid = format('%I.%I', seq.schemaname, seq.sequencename)::regclass
+WHERE dep.classid = 'pg_class'::regclass
+    AND dep.refobjid = ANY(ARRAY[{tables}]::regclass[])
+    AND dep.deptype IN ('a', 'i')
+    AND seq.last_value IS NOT NULL;
+
+SELECT 'COMMIT;';
 
-from . import _config, printing
+ROLLBACK;
+"""
 
 
 @invoke.task
@@ -13,26 +359,194 @@ def load_db_dump(
     password: str,
     file: str = "",
     additional_params: str = "",
+    fast: bool = False,
+    disable_triggers: bool = False,
+    jobs: int = 0,
+    verify_manifest: bool = True,
 ) -> None:
-    """Load db dump to local db."""
+    """Load db dump to local db.
+
+    Use `fast` to apply bulk load settings for the loading session and load
+    dump in single transaction, `ANALYZE` is run afterwards. Use
+    `disable_triggers` to skip triggers (including foreign key checks) during
+    load, it requires superuser.
+
+    Use `jobs` to restore dump by sections: pre-data, data and then post-data
+    (indexes and constraints) using `jobs` connections. Dumps in custom or
+    directory format are always restored by sections via `pg_restore`.
+
+    Plain dumps compressed with gzip, zstd or xz (for example,
+    `dump.sql.gz`) are decompressed as a stream right into psql.
+
+    If dump has manifest, dump is checked against it before load (disable
+    with `verify_manifest`).
+
+    """
     config = _config.Config.from_context(context)
-    context.run(
-        config.db.load_dump_command.format(
-            dbname=dbname,
-            host=host,
-            port=port,
-            username=username,
-            file=file or config.db.dump_filename,
-            additional_params=additional_params
-            or config.db.load_additional_params,
-        ),
-        watchers=(
-            invoke.Responder(
-                pattern=config.db.password_pattern,
-                response=f"{password}\n",
+    file = file or config.db.dump_filename
+    if verify_manifest:
+        verify_dump_manifest(context, file=file)
+    db_settings = {
+        "dbname": dbname,
+        "host": host,
+        "port": port,
+        "username": username,
+    }
+    session_settings: dict[str, str] = {}
+    if fast:
+        session_settings.update(config.db.fast_load_settings)
+    if disable_triggers:
+        session_settings["session_replication_role"] = "replica"
+    env = get_session_settings_env(session_settings)
+    decompress_command = _get_decompress_command(context, file=file)
+    if decompress_command and jobs:
+        printing.print_warn(
+            "Compressed dump can't be loaded by sections, "
+            "so it's loaded in single connection.",
+        )
+    if not decompress_command and _is_archive_dump(file):
+        _restore_archive_by_sections(
+            context,
+            file=file,
+            password=password,
+            jobs=max(jobs, 1),
+            env=env,
+            additional_params=additional_params,
+            **db_settings,
+        )
+    elif not decompress_command and jobs:
+        _load_plain_dump_by_sections(
+            context,
+            file=file,
+            password=password,
+            jobs=jobs,
+            env=env,
+            additional_params=additional_params,
+            **db_settings,
+        )
+    else:
+        additional_params = (
+            additional_params or config.db.load_additional_params
+        )
+        if fast and config.db.fast_load_single_transaction:
+            additional_params = (
+                f"{additional_params} --single-transaction "
+                "--set ON_ERROR_STOP=1"
+            )
+        command = config.db.load_dump_command.format(
+            file="-" if decompress_command else file,
+            additional_params=additional_params,
+            **db_settings,
+        )
+        if decompress_command:
+            # Dump is decompressed right into psql, so it's not stored on disk
+            command = f"set -o pipefail; {decompress_command} | {command}"
+        run_with_password(
+            context,
+            command=command,
+            password=password,
+            env=env,
+        )
+    if fast:
+        printing.print_success("Analyzing loaded data")
+        run_with_password(
+            context,
+            command=config.db.analyze_command.format(**db_settings),
+            password=password,
+        )
+    printing.print_success("DB is ready for use")
+
+
+@invoke.task(iterable=["tables", "schemas", "sections"])
+def load_db_dump_selectively(
+    context: invoke.Context,
+    dbname: str,
+    host: str,
+    port: str,
+    username: str,
+    password: str,
+    file: str = "",
+    tables: collections.abc.Sequence[str] | None = None,
+    schemas: collections.abc.Sequence[str] | None = None,
+    sections: collections.abc.Sequence[str] | None = None,
+    jobs: int = 1,
+    additional_params: str = "",
+) -> None:
+    """Load chosen tables, schemas or sections of db dump to local db.
+
+    Works with dumps in custom or directory format. Tables are matched as
+    `schema.table` or `table` and restored along with their sequences,
+    defaults, constraints, indexes and triggers. Catalog of dump is cached
+    next to it, so dump is read only once to find out what belongs to tables.
+    Without tables and schemas whole dump is loaded, which is useful along
+    with `sections`.
+
+    """
+    config = _config.Config.from_context(context)
+    file = file or config.db.dump_filename
+    tables = tables or ()
+    schemas = schemas or ()
+    sections = sections or ()
+    if not _is_archive_dump(file):
+        raise invoke.Exit(
+            code=1,
+            message=(
+                f"{file} is not in custom or directory format, "
+                "only such dumps can be loaded selectively."
+            ),
+        )
+    if unknown_sections := set(sections) - set(_DUMP_SECTIONS):
+        raise invoke.Exit(
+            code=1,
+            message=(
+                f"Unknown sections: {', '.join(sorted(unknown_sections))}, "
+                f"expected: {', '.join(_DUMP_SECTIONS)}."
             ),
+        )
+    catalog = _get_dump_catalog(context, file=file)
+    selected_tables = {_parse_qualified_name(table) for table in tables}
+    selected_lines = [
+        entry.line
+        for entry in catalog
+        if (not tables and not schemas)
+        or entry.schema in schemas
+        or (entry.schema, entry.table) in selected_tables
+        or (None, entry.table) in selected_tables
+    ]
+    if not selected_lines:
+        raise invoke.Exit(
+            code=1,
+            message="Nothing in dump matches chosen tables and schemas.",
+        )
+    system.create_tmp_folder(context)
+    list_path = pathlib.Path(".tmp/restore.list")
+    list_path.write_text("\n".join(selected_lines) + "\n")
+    additional_params = " ".join(
+        (
+            additional_params or config.db.restore_additional_params,
+            f"--use-list={list_path}",
+            f"--jobs={jobs}",
+            *(f"--section={section}" for section in sections),
         ),
     )
+    printing.print_success(
+        f"Restoring {len(selected_lines)} of {len(catalog)} entries of {file}",
+    )
+    try:
+        run_with_password(
+            context,
+            command=config.db.restore_command.format(
+                dbname=dbname,
+                host=host,
+                port=port,
+                username=username,
+                file=file,
+                additional_params=additional_params,
+            ),
+            password=password,
+        )
+    finally:
+        list_path.unlink()
     printing.print_success("DB is ready for use")
 
 
@@ -49,7 +563,568 @@ def backup_local_db(
 ) -> None:
     """Back up local db."""
     config = _config.Config.from_context(context)
+    db_settings = {
+        "dbname": dbname,
+        "host": host,
+        "port": port,
+        "username": username,
+    }
+    additional_params = additional_params or _get_dump_additional_params(
+        context,
+    )
+    if (
+        config.db.dump_exclude_table_data_size
+        or config.db.dump_exclude_table_data_patterns
+    ):
+        printing.print_success("Checking sizes of tables in local db.")
+        result = run_with_password(
+            context,
+            command=config.db.table_sizes_command.format(
+                query=shlex.quote(
+                    generate_table_sizes_query(
+                        config.db.dump_exclude_table_data_size,
+                    ),
+                ),
+                **db_settings,
+            ),
+            password=password,
+            hide="out",
+        )
+        additional_params = " ".join(
+            (
+                additional_params,
+                *generate_exclude_table_data_params(
+                    table_sizes_output=result.stdout if result else "",
+                    patterns=config.db.dump_exclude_table_data_patterns,
+                ),
+            ),
+        )
     printing.print_success("Creating backup of local db.")
+    file = file or config.db.dump_filename
+    remove_dump_manifest(file)
+    run_with_password(
+        context,
+        command=config.db.dump_command.format(
+            file=file,
+            additional_params=additional_params,
+            **db_settings,
+        ),
+        password=password,
+    )
+    write_dump_manifest(
+        context,
+        file=file,
+        env="local",
+        options=additional_params,
+    )
+
+
+@invoke.task(iterable=["root_tables"])
+def backup_local_db_subset(
+    context: invoke.Context,
+    dbname: str,
+    host: str,
+    port: str,
+    username: str,
+    password: str,
+    root_tables: collections.abc.Sequence[str],
+    percent: float = 100.0,
+    limit: int = 0,
+    file: str = "",
+) -> None:
+    """Back up referentially consistent subset of local db.
+
+    Rows of `root_tables` are sampled by `percent` and/or `limit`, then all
+    rows they reference via foreign keys are added. Schema is dumped fully.
+
+    """
+    config = _config.Config.from_context(context)
+    script = generate_subset_script(
+        root_tables=root_tables,
+        percent=percent,
+        limit=limit,
+    )
+    printing.print_success(
+        f"Creating backup of local db subset of {', '.join(root_tables)}.",
+    )
+    system.create_tmp_folder(context)
+    script_path = pathlib.Path(".tmp/subset.sql")
+    script_path.write_text(script)
+    file = file or config.db.dump_filename
+    db_settings = {
+        "dbname": dbname,
+        "host": host,
+        "port": port,
+        "username": username,
+    }
+    dump_params = _get_dump_additional_params(context)
+    remove_dump_manifest(file)
+    try:
+        for section, section_file in (
+            ("pre-data", file),
+            ("post-data", f"{file}.post-data"),
+        ):
+            run_with_password(
+                context,
+                command=config.db.dump_command.format(
+                    file=section_file,
+                    additional_params=f"{dump_params} --section={section}",
+                    **db_settings,
+                ),
+                password=password,
+            )
+        run_with_password(
+            context,
+            command=config.db.subset_command.format(
+                script=script_path,
+                file=f"{file}.data",
+                **db_settings,
+            ),
+            password=password,
+        )
+        with pathlib.Path(file).open(mode="ab") as dump_file:
+            for part in (f"{file}.data", f"{file}.post-data"):
+                with pathlib.Path(part).open(mode="rb") as part_file:
+                    shutil.copyfileobj(part_file, dump_file)
+    finally:
+        script_path.unlink()
+        for part in (f"{file}.data", f"{file}.post-data"):
+            pathlib.Path(part).unlink(missing_ok=True)
+    write_dump_manifest(
+        context,
+        file=file,
+        env="local",
+        options=dump_params,
+    )
+    printing.print_success(f"Subset of db saved to {file}")
+
+
+def load_growing_db_dump(
+    context: invoke.Context,
+    dbname: str,
+    host: str,
+    port: str,
+    username: str,
+    password: str,
+    file: str,
+    is_complete: collections.abc.Callable[[], bool],
+) -> None:
+    """Load plain db dump which is still being written to local db.
+
+    Dump is fed to psql as it grows until `is_complete` returns `True`, so
+    load can start before dump is downloaded. Dump is expected to be in
+    UTF-8.
+
+    Since dump is passed via stdin, password is never answered to prompt,
+    it's passed via `PGPASSWORD` in `prompt` mode of `credentials_mode`.
+
+    """
+    config = _config.Config.from_context(context)
+    printing.print_success(f"Loading {file} while it's being downloaded")
+    with get_credentials_env(context, password) as credentials_env:
+        context.run(
+            config.db.load_dump_command.format(
+                dbname=dbname,
+                host=host,
+                port=port,
+                username=username,
+                additional_params=config.db.load_additional_params,
+                file="-",
+            ),
+            env=credentials_env or {"PGPASSWORD": password},
+            in_stream=_GrowingDumpReader(
+                path=pathlib.Path(file),
+                is_complete=is_complete,
+            ),
+            pty=False,
+        )
+    printing.print_success("DB is ready for use")
+
+
+def write_dump_manifest(
+    context: invoke.Context,
+    file: str,
+    env: str,
+    options: str,
+    source_size: int | None = None,
+    source_sha256: str = "",
+) -> None:
+    """Write manifest of dump next to it.
+
+    Manifest contains size, sha256, source env, pg_dump version, options and
+    row counts of tables (for plain dumps). If dump is copied from elsewhere,
+    pass `source_size` and `source_sha256` of original dump, they are saved
+    in manifest, and error is raised if copy doesn't match them.
+
+    """
+    printing.print_success(f"Writing manifest of {file}")
+    size, sha256, row_counts, pg_dump_version = _scan_dump(file)
+    if not pg_dump_version and _is_archive_dump(file):
+        pg_dump_version = _get_archive_pg_dump_version(context, file=file)
+    manifest = {
+        "file": pathlib.Path(file).name,
+        "size": size if source_size is None else source_size,
+        "sha256": source_sha256 or sha256,
+        "env": env,
+        "created_at": datetime.datetime.now(tz=datetime.timezone.utc)
+        .replace(microsecond=0)
+        .isoformat(),
+        "pg_dump_version": pg_dump_version,
+        "options": " ".join(options.split()),
+        "row_counts": row_counts,
+    }
+    _get_manifest_path(file).write_text(json.dumps(manifest, indent=2))
+    if (manifest["size"], manifest["sha256"]) != (size, sha256):
+        raise invoke.Exit(
+            code=1,
+            message=(
+                f"{file} doesn't match its source: size {size} and sha256 "
+                f"{sha256}, expected {manifest['size']} and "
+                f"{manifest['sha256']}. Looks like it's not fully copied."
+            ),
+        )
+
+
+def remove_dump_manifest(file: str) -> None:
+    """Remove manifest of dump which is going to be overwritten.
+
+    Otherwise dump which failed midway would be checked against manifest of
+    previous dump.
+
+    """
+    _get_manifest_path(file).unlink(missing_ok=True)
+
+
+def verify_dump_manifest(context: invoke.Context, file: str = "") -> None:
+    """Check that dump matches its manifest.
+
+    Size is always checked, sha256 is checked only if
+    `verify_dump_checksum` is set, since it requires reading whole dump.
+    Dumps without manifest are not checked.
+
+    """
+    config = _config.Config.from_context(context)
+    file = file or config.db.dump_filename
+    manifest_path = _get_manifest_path(file)
+    if not manifest_path.exists():
+        printing.print_warn(f"{file} has no manifest, skipping verification.")
+        return
+    manifest = json.loads(manifest_path.read_text())
+    if not pathlib.Path(file).exists():
+        raise invoke.Exit(code=1, message=f"{file} doesn't exist.")
+    size = get_dump_size(file)
+    if size != manifest["size"]:
+        raise invoke.Exit(
+            code=1,
+            message=(
+                f"Size of {file} is {size}, but {manifest['size']} is "
+                "expected by its manifest. Looks like it's truncated."
+            ),
+        )
+    if config.db.verify_dump_checksum:
+        _, sha256, _, _ = _scan_dump(file)
+        if sha256 != manifest["sha256"]:
+            raise invoke.Exit(
+                code=1,
+                message=(
+                    f"sha256 of {file} is {sha256}, but "
+                    f"{manifest['sha256']} is expected by its manifest."
+                ),
+            )
+    printing.print_success(
+        f"{file} matches its manifest: dumped from {manifest['env']} at "
+        f"{manifest['created_at']} by pg_dump "
+        f"{manifest['pg_dump_version']}",
+    )
+
+
+def is_accepting_connections(
+    host: str,
+    port: str,
+    dbname: str,
+    username: str,
+    timeout: float = 1.0,
+) -> bool:
+    """Check that db accepts connections via PostgreSQL startup handshake.
+
+    Startup message is sent and db is considered ready if it asks for
+    authentication or rejects connection for any reason except starting up or
+    shutting down (so wrong credentials are reported by actual command).
+
+    """
+    params = b"".join(
+        f"{name}\0{value}\0".encode()
+        for name, value in (("user", username), ("database", dbname))
+    )
+    startup_message = struct.pack(
+        "!ii",
+        len(params) + 9,
+        _PROTOCOL_VERSION,
+    )
+    try:
+        with socket.create_connection(
+            (host, int(port or _DEFAULT_PORT)),
+            timeout=timeout,
+        ) as connection:
+            connection.sendall(startup_message + params + b"\0")
+            response = connection.recv(1024)
+    except OSError:
+        return False
+    if response.startswith(b"R"):
+        return True
+    return (
+        response.startswith(b"E") and _CANNOT_CONNECT_NOW_ERROR not in response
+    )
+
+
+def wait_for_connection(
+    host: str,
+    port: str,
+    dbname: str,
+    username: str,
+    timeout: float,
+) -> None:
+    """Wait until db accepts connections with exponential backoff.
+
+    `socket.gaierror` is raised if host can't be resolved.
+
+    """
+    socket.getaddrinfo(host, int(port or _DEFAULT_PORT))
+    delays = iterate_backoff_delays(timeout)
+    while not is_accepting_connections(
+        host=host,
+        port=port,
+        dbname=dbname,
+        username=username,
+    ):
+        delay = next(delays, None)
+        if delay is None:
+            raise invoke.Exit(
+                code=1,
+                message=f"Db at {host}:{port} is not ready in {timeout}s",
+            )
+        time.sleep(delay)
+
+
+def iterate_backoff_delays(
+    timeout: float,
+) -> collections.abc.Iterator[float]:
+    """Iterate over delays of exponential backoff with jitter.
+
+    Base delay doubles on each step (up to max delay) and actual delay is
+    random value between half of base delay and base delay, so several
+    waiting clients don't retry at the same moment. Iteration stops when
+    delay would exceed deadline of `timeout` seconds.
+
+    """
+    deadline = time.monotonic() + timeout
+    delay = _WAIT_FOR_CONNECTION_MIN_DELAY
+    while True:
+        jittered_delay = random.uniform(delay / 2, delay)  # noqa: S311
+        if time.monotonic() + jittered_delay > deadline:
+            return
+        yield jittered_delay
+        delay = min(delay * 2, _WAIT_FOR_CONNECTION_MAX_DELAY)
+
+
+def get_dump_size(file: str) -> int:
+    """Get size of dump file or directory format dump."""
+    path = pathlib.Path(file)
+    if not path.is_dir():
+        return path.stat().st_size
+    return sum(
+        part.stat().st_size for part in path.rglob("*") if part.is_file()
+    )
+
+
+def generate_subset_script(
+    root_tables: collections.abc.Sequence[str],
+    percent: float = 100.0,
+    limit: int = 0,
+) -> str:
+    """Generate psql script which outputs subset of db data.
+
+    Output is `COPY` blocks for every table with selected rows, so it can be
+    placed between `pre-data` and `post-data` sections of plain dump.
+
+    """
+    if not root_tables:
+        raise invoke.Exit(
+            code=1,
+            message="Please, provide at least one root table for subset.",
+        )
+    if not 0 < percent <= 100:
+        raise invoke.Exit(
+            code=1,
+            message=f"Percent should be in range (0, 100], got {percent}.",
+        )
+    if limit < 0:
+        raise invoke.Exit(
+            code=1,
+            message=f"Limit should not be negative, got {limit}.",
+        )
+    sample_clause = "''"
+    if percent < 100:
+        sample_clause = f"'TABLESAMPLE BERNOULLI ({percent})'"
+    limit_clause = f"'LIMIT {limit}'" if limit else "''"
+    return _SUBSET_SCRIPT_TEMPLATE.format(
+        root_tables=", ".join(
+            "'{}'".format(table.replace("'", "''")) for table in root_tables
+        ),
+        sample_clause=sample_clause,
+        limit_clause=limit_clause,
+    )
+
+
+def generate_sync_tables_script(
+    tables: collections.abc.Sequence[str],
+    where: str = "",
+) -> str:
+    """Generate psql script which outputs script to sync tables.
+
+    Output truncates `tables` and fills them with rows matching `where`
+    condition in single transaction. Rows are copied in order of `tables`.
+
+    """
+    if not tables:
+        raise invoke.Exit(
+            code=1,
+            message="Please, provide at least one table to sync.",
+        )
+    return _SYNC_TABLES_SCRIPT_TEMPLATE.format(
+        tables=", ".join(
+            "'{}'".format(table.replace("'", "''")) for table in tables
+        ),
+        where="'{}'".format((where or "true").replace("'", "''")),
+    )
+
+
+def generate_table_sizes_query(size_threshold: str = "") -> str:
+    """Generate query which returns sizes of tables.
+
+    Each row contains table name, size in bytes, pretty size and whether
+    size is bigger than `size_threshold` (for example, `1GB`).
+
+    """
+    threshold = "NULL"
+    if size_threshold:
+        threshold = "'{}'".format(size_threshold.replace("'", "''"))
+    return _TABLE_SIZES_QUERY_TEMPLATE.format(threshold=threshold)
+
+
+@dataclasses.dataclass
+class TableSize:
+    """Size of table from output of table sizes query."""
+
+    table: str
+    size: int
+    pretty_size: str
+    # Empty reason means that data is kept in dump
+    exclusion_reason: str
+
+
+def get_table_sizes(
+    table_sizes_output: str,
+    patterns: collections.abc.Sequence[str] = (),
+) -> list[TableSize]:
+    """Parse table sizes and decide which tables data is excluded from dump.
+
+    Data of table is excluded if its size is bigger than threshold or its
+    name matches one of regex `patterns`.
+
+    """
+    return [
+        TableSize(
+            table=match["table"],
+            size=int(match["size"]),
+            pretty_size=match["pretty_size"],
+            exclusion_reason=_get_table_data_exclusion_reason(
+                match,
+                patterns,
+            ),
+        )
+        for match in _TABLE_SIZE_REGEX.finditer(table_sizes_output)
+    ]
+
+
+def print_table_sizes_report(
+    table_sizes: collections.abc.Sequence[TableSize],
+) -> tuple[int, int]:
+    """Print report about sizes of kept and skipped tables.
+
+    Total sizes of tables which data is kept and skipped are returned.
+
+    """
+    report = rich.table.Table(
+        "Table",
+        "Size",
+        "Data",
+        title="Dump size report",
+    )
+    kept_size = skipped_size = kept_tables = 0
+    for table_size in table_sizes:
+        if table_size.exclusion_reason:
+            skipped_size += table_size.size
+            report.add_row(
+                table_size.table,
+                table_size.pretty_size,
+                rich.text.Text(
+                    f"skipped ({table_size.exclusion_reason})",
+                    style="yellow",
+                ),
+            )
+            continue
+        kept_size += table_size.size
+        kept_tables += 1
+        if kept_tables <= _SIZE_REPORT_KEPT_TABLES:
+            report.add_row(table_size.table, table_size.pretty_size, "kept")
+    report.caption = (
+        f"Kept: {kept_size / 1024**2:.1f} MB, "
+        f"skipped: {skipped_size / 1024**2:.1f} MB "
+        f"(only {_SIZE_REPORT_KEPT_TABLES} biggest kept tables are shown)"
+    )
+    printing.print_success(report)
+    return kept_size, skipped_size
+
+
+def generate_exclude_table_data_params(
+    table_sizes_output: str,
+    patterns: collections.abc.Sequence[str] = (),
+) -> list[str]:
+    """Generate `--exclude-table-data` params from table sizes.
+
+    Tables are excluded as in `get_table_sizes`. Report about sizes of kept
+    and skipped tables is printed.
+
+    """
+    table_sizes = get_table_sizes(table_sizes_output, patterns)
+    print_table_sizes_report(table_sizes)
+    return [
+        f"--exclude-table-data={shlex.quote(table_size.table)}"
+        for table_size in table_sizes
+        if table_size.exclusion_reason
+    ]
+
+
+def _get_table_data_exclusion_reason(
+    match: re.Match[str],
+    patterns: collections.abc.Sequence[str],
+) -> str:
+    """Get reason why data of table from size report is excluded from dump.
+
+    Empty reason means that data is kept.
+
+    """
+    if match["too_big"] == "t":
+        return "too big"
+    if any(re.search(pattern, match["table"]) for pattern in patterns):
+        return "matches pattern"
+    return ""
+
+
+def _get_dump_additional_params(context: invoke.Context) -> str:
+    """Get additional params for dump command from settings."""
+    config = _config.Config.from_context(context)
     additional_params_list = [
         config.db.dump_additional_params,
     ]
@@ -73,20 +1148,667 @@ def backup_local_db(
         additional_params_list.append(
             f"--exclude-extension={config.db.dump_exclude_extension}",
         )
-    context.run(
-        config.db.dump_command.format(
-            dbname=dbname,
-            host=host,
-            port=port,
-            username=username,
-            file=file or config.db.dump_filename,
-            additional_params=additional_params
-            or " ".join(additional_params_list),
+    return " ".join(additional_params_list)
+
+
+def _get_decompress_command(context: invoke.Context, file: str) -> str:
+    """Get command which decompresses dump to stdout.
+
+    Empty string is returned if dump is not compressed.
+
+    """
+    config = _config.Config.from_context(context)
+    for extension, command in config.db.decompress_commands.items():
+        if file.endswith(extension):
+            return command.format(file=file)
+    return ""
+
+
+def _get_manifest_path(file: str) -> pathlib.Path:
+    """Get path to manifest of dump."""
+    path = pathlib.Path(file)
+    return path.with_name(f"{path.name}{_MANIFEST_SUFFIX}")
+
+
+def _scan_dump(file: str) -> tuple[int, str, dict[str, int], str]:
+    """Read dump to get its size, sha256, row counts and pg_dump version.
+
+    Files of directory format dump are hashed in order of their names. Row
+    counts and pg_dump version are found only in plain dumps.
+
+    """
+    path = pathlib.Path(file)
+    files = (
+        sorted(part for part in path.rglob("*") if part.is_file())
+        if path.is_dir()
+        else [path]
+    )
+    size = 0
+    sha256 = hashlib.sha256()
+    row_counts: collections.Counter[str] = collections.Counter()
+    pg_dump_version = ""
+    copy_table = ""
+    for dump_file_path in files:
+        if path.is_dir():
+            sha256.update(str(dump_file_path.relative_to(path)).encode())
+        with dump_file_path.open(mode="rb") as dump_file:
+            for line in dump_file:
+                size += len(line)
+                sha256.update(line)
+                if copy_table:
+                    if line == b"\\.\n":
+                        copy_table = ""
+                    else:
+                        row_counts[copy_table] += 1
+                elif copy_match := _COPY_TABLE_REGEX.match(line):
+                    copy_table = copy_match["table"].decode()
+                    row_counts[copy_table] += 0
+                elif not pg_dump_version and (
+                    match := _PG_DUMP_VERSION_REGEX.match(
+                        line.decode(errors="replace").rstrip(),
+                    )
+                ):
+                    pg_dump_version = match["version"]
+    return size, sha256.hexdigest(), dict(row_counts), pg_dump_version
+
+
+def _get_archive_pg_dump_version(context: invoke.Context, file: str) -> str:
+    """Get version of pg_dump which made custom or directory format dump."""
+    config = _config.Config.from_context(context)
+    result = context.run(
+        config.db.catalog_command.format(
+            file=file,
+            additional_params="--list",
         ),
-        watchers=(
-            invoke.Responder(
-                pattern=config.db.password_pattern,
-                response=f"{password}\n",
+        hide="out",
+        pty=False,
+    )
+    match = _PG_DUMP_VERSION_REGEX.search(result.stdout if result else "")
+    return match["version"] if match else ""
+
+
+def _is_archive_dump(file: str) -> bool:
+    """Check if dump is in custom or directory format of pg_dump."""
+    path = pathlib.Path(file)
+    if not path.exists():
+        raise invoke.Exit(code=1, message=f"{file} not found")
+    if path.is_dir():
+        return (path / "toc.dat").exists()
+    with path.open(mode="rb") as dump_file:
+        return dump_file.read(len(_ARCHIVE_MAGIC)) == _ARCHIVE_MAGIC
+
+
+def _restore_archive_by_sections(
+    context: invoke.Context,
+    file: str,
+    dbname: str,
+    host: str,
+    port: str,
+    username: str,
+    password: str,
+    jobs: int,
+    env: dict[str, str],
+    additional_params: str = "",
+) -> None:
+    """Restore custom or directory format dump section by section."""
+    config = _config.Config.from_context(context)
+    additional_params = (
+        additional_params or config.db.restore_additional_params
+    )
+    for section, section_jobs in (
+        ("pre-data", 1),
+        ("data", jobs),
+        ("post-data", jobs),
+    ):
+        printing.print_success(f"Restoring {section} section of dump")
+        run_with_password(
+            context,
+            command=config.db.restore_command.format(
+                dbname=dbname,
+                host=host,
+                port=port,
+                username=username,
+                file=file,
+                additional_params=(
+                    f"{additional_params} "
+                    f"--section={section} --jobs={section_jobs}"
+                ),
             ),
+            password=password,
+            env=env,
+        )
+
+
+@dataclasses.dataclass
+class _CatalogEntry:
+    """Entry of `pg_restore --list` output of dump.
+
+    `schema` and `table` are empty if entry doesn't belong to schema or
+    table.
+
+    """
+
+    line: str
+    schema: str
+    table: str
+
+
+def _get_dump_catalog(
+    context: invoke.Context,
+    file: str,
+) -> list[_CatalogEntry]:
+    """Get catalog of dump in custom or directory format.
+
+    Catalog is cached next to dump and rebuilt once dump is changed.
+
+    """
+    path = pathlib.Path(file)
+    catalog_path = path.with_name(f"{path.name}{_CATALOG_SUFFIX}")
+    toc_path = path / "toc.dat" if path.is_dir() else path
+    if (
+        catalog_path.exists()
+        and catalog_path.stat().st_mtime >= toc_path.stat().st_mtime
+    ):
+        return [
+            _CatalogEntry(**entry)
+            for entry in json.loads(catalog_path.read_text())
+        ]
+    catalog = _build_dump_catalog(context, file=file)
+    catalog_path.write_text(
+        json.dumps([dataclasses.asdict(entry) for entry in catalog]),
+    )
+    return catalog
+
+
+def _build_dump_catalog(
+    context: invoke.Context,
+    file: str,
+) -> list[_CatalogEntry]:
+    """Build catalog of dump in custom or directory format.
+
+    Names in `pg_restore --list` output are ambiguous (for example,
+    constraint entry is named as `table constraint`), so tables objects
+    belong to are found in schema-only script of dump.
+
+    """
+    config = _config.Config.from_context(context)
+    printing.print_success(f"Building catalog of {file}")
+    outputs = [
+        result.stdout if result else ""
+        for result in (
+            context.run(
+                config.db.catalog_command.format(
+                    file=file,
+                    additional_params=params,
+                ),
+                hide="out",
+                pty=False,
+            )
+            for params in ("--list", "--schema-only --file=-")
+        )
+    ]
+    list_output, schema_output = outputs
+    # Map `type schema name` descriptions of objects to (schema, table)
+    tables: dict[str, tuple[str, str]] = {}
+    headers = list(_SCRIPT_HEADER_REGEX.finditer(schema_output))
+    for header, next_header in zip(
+        headers,
+        [*headers[1:], None],
+        strict=True,
+    ):
+        body = schema_output[
+            header.end() : next_header.start() if next_header else None
+        ]
+        description = " ".join(
+            (header["type"], header["schema"], header["name"]),
+        )
+        tables[description] = (header["schema"], "")
+        if match := _OBJECT_TABLE_REGEX.search(body):
+            tables[description] = (
+                _unquote_identifier(match["schema"]),
+                _unquote_identifier(match["name"]),
+            )
+    catalog: list[_CatalogEntry] = []
+    for line in list_output.splitlines():
+        match = _CATALOG_LINE_REGEX.match(line)
+        if not match:
+            continue
+        # Description is `type schema name owner`
+        description = match["description"].rsplit(" ", 1)[0]
+        schema, table = tables.get(description, ("", ""))
+        for prefix, source_type in (
+            ("TABLE DATA ", "TABLE "),
+            ("SEQUENCE ", "SEQUENCE OWNED BY "),
+            ("SEQUENCE SET ", "SEQUENCE OWNED BY "),
+        ):
+            source = source_type + description.removeprefix(prefix)
+            if (
+                not table
+                and description.startswith(prefix)
+                and source in tables
+            ):
+                schema, table = tables[source]
+        catalog.append(_CatalogEntry(line=line, schema=schema, table=table))
+    return catalog
+
+
+def _parse_qualified_name(name: str) -> tuple[str | None, str]:
+    """Parse `schema.table` or `table` name into (schema, table)."""
+    match = _QUALIFIED_NAME_REGEX.match(name)
+    if not match:
+        raise invoke.Exit(code=1, message=f"Invalid table name: {name}.")
+    schema = match["schema"]
+    return (
+        _unquote_identifier(schema) if schema else None,
+        _unquote_identifier(match["name"]),
+    )
+
+
+def _unquote_identifier(identifier: str) -> str:
+    """Unquote SQL identifier."""
+    if identifier.startswith('"'):
+        return identifier[1:-1].replace('""', '"')
+    return identifier
+
+
+def _load_plain_dump_by_sections(
+    context: invoke.Context,
+    file: str,
+    dbname: str,
+    host: str,
+    port: str,
+    username: str,
+    password: str,
+    jobs: int,
+    env: dict[str, str],
+    additional_params: str = "",
+) -> None:
+    """Load plain dump section by section.
+
+    Dump is split using comments which pg_dump puts before each object.
+    Pre-data is loaded first, then data is streamed right from the dump file.
+    Indexes and constraints of post-data are grouped by table and run
+    concurrently in `jobs` connections, the rest of post-data (foreign keys,
+    triggers, etc.) is loaded afterwards in original order.
+
+    """
+    config = _config.Config.from_context(context)
+    additional_params = (
+        f"{additional_params or config.db.load_additional_params} "
+        "--set ON_ERROR_STOP=1"
+    )
+    system.create_tmp_folder(context)
+    sections_dir = pathlib.Path(".tmp/sections")
+    sections_dir.mkdir(exist_ok=True)
+    printing.print_success(f"Splitting {file} into sections")
+    sections = _split_plain_dump(file, jobs=jobs, sections_dir=sections_dir)
+
+    def load(
+        section_file: str,
+        prefix: str = "",
+        **kwargs,
+    ) -> invoke.runners.Result | None:
+        return run_with_password(
+            context,
+            command=prefix
+            + config.db.load_dump_command.format(
+                dbname=dbname,
+                host=host,
+                port=port,
+                username=username,
+                file=section_file,
+                additional_params=additional_params,
+            ),
+            password=password,
+            env=env,
+            **kwargs,
+        )
+
+    try:
+        printing.print_success("Loading pre-data section of dump")
+        load(str(sections.pre_data))
+        if sections.data_size:
+            printing.print_success("Loading data section of dump")
+            # Data is streamed to avoid copying the biggest part of the dump
+            load(
+                "-",
+                prefix=(
+                    f"(cat {sections.preamble} && "
+                    f"tail -c +{sections.data_start + 1} {file} | "
+                    f"head -c {sections.data_size}) | "
+                ),
+            )
+        printing.print_success(
+            "Building indexes and constraints in "
+            f"{len(sections.parallel_post_data)} connections",
+        )
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=len(sections.parallel_post_data) or 1,
+        ) as executor:
+            for future in concurrent.futures.as_completed(
+                executor.submit(load, str(post_data), in_stream=False)
+                for post_data in sections.parallel_post_data
+            ):
+                future.result()
+        printing.print_success("Loading rest of post-data section of dump")
+        load(str(sections.post_data))
+    finally:
+        shutil.rmtree(sections_dir)
+
+
+@dataclasses.dataclass
+class _PlainDumpSections:
+    """Description of plain dump split into sections."""
+
+    preamble: pathlib.Path
+    pre_data: pathlib.Path
+    data_start: int
+    data_size: int
+    parallel_post_data: list[pathlib.Path]
+    post_data: pathlib.Path
+
+
+def _split_plain_dump(
+    file: str,
+    jobs: int,
+    sections_dir: pathlib.Path,
+) -> _PlainDumpSections:
+    """Split plain dump into sections.
+
+    Only pre-data and post-data are saved into separate files, data section
+    is described by its offset and size in the dump file.
+
+    """
+    entries, file_size = _scan_plain_dump(file)
+    preamble_end = entries[0][2] if entries else file_size
+    post_data_start = next(
+        (
+            entry_offset
+            for entry_type, _, entry_offset in entries
+            if entry_type in _POST_DATA_TYPES
+        ),
+        file_size,
+    )
+    data_start = next(
+        (
+            entry_offset
+            for entry_type, _, entry_offset in entries
+            if entry_type in _DATA_TYPES and entry_offset < post_data_start
         ),
+        post_data_start,
     )
+    # Size of data is used as estimation of index build time
+    tables_data_size: dict[bytes, int] = collections.defaultdict(int)
+    for (entry_type, table, entry_offset), next_offset in zip(
+        entries,
+        [*(entry[2] for entry in entries[1:]), file_size],
+        strict=True,
+    ):
+        if entry_type in _DATA_TYPES:
+            tables_data_size[table] += next_offset - entry_offset
+
+    sections = _PlainDumpSections(
+        preamble=sections_dir / "preamble.sql",
+        pre_data=sections_dir / "pre-data.sql",
+        data_start=data_start,
+        data_size=post_data_start - data_start,
+        parallel_post_data=[],
+        post_data=sections_dir / "post-data.sql",
+    )
+    with pathlib.Path(file).open(mode="rb") as dump_file:
+        preamble = dump_file.read(preamble_end)
+        sections.preamble.write_bytes(preamble)
+        dump_file.seek(0)
+        with sections.pre_data.open(mode="wb") as pre_data_file:
+            _copy_file_part(dump_file, pre_data_file, size=data_start)
+        dump_file.seek(post_data_start)
+        post_data = dump_file.read()
+
+    post_data_entries = [
+        (
+            entry_type,
+            post_data[
+                entry_offset - post_data_start : next_offset - post_data_start
+            ],
+        )
+        for (entry_type, _, entry_offset), next_offset in zip(
+            entries,
+            [*(entry[2] for entry in entries[1:]), file_size],
+            strict=True,
+        )
+        if entry_offset >= post_data_start
+    ]
+    jobs_statements, rest_statements = _distribute_post_data(
+        post_data_entries,
+        jobs=jobs,
+        tables_data_size=tables_data_size,
+    )
+    for job, statements in enumerate(filter(None, jobs_statements)):
+        job_post_data = sections_dir / f"post-data-{job}.sql"
+        job_post_data.write_bytes(b"".join((preamble, *statements)))
+        sections.parallel_post_data.append(job_post_data)
+    sections.post_data.write_bytes(b"".join((preamble, *rest_statements)))
+    return sections
+
+
+def _scan_plain_dump(
+    file: str,
+) -> tuple[list[tuple[bytes, bytes, int]], int]:
+    """Find objects of plain dump.
+
+    Return list of objects (type, table, offset) and size of dump.
+
+    """
+    entries: list[tuple[bytes, bytes, int]] = []
+    offset = 0
+    in_copy = False
+    with pathlib.Path(file).open(mode="rb") as dump_file:
+        for line in dump_file:
+            if in_copy:
+                in_copy = line != b"\\.\n"
+            elif line.startswith(b"COPY ") and line.endswith(b"FROM stdin;\n"):
+                in_copy = True
+            elif match := _TOC_HEADER_REGEX.match(line):
+                entries.append(
+                    (
+                        match["type"],
+                        match["schema"] + b"." + match["name"],
+                        offset,
+                    ),
+                )
+            offset += len(line)
+    return entries, offset
+
+
+def _distribute_post_data(
+    post_data_entries: list[tuple[bytes, bytes]],
+    jobs: int,
+    tables_data_size: dict[bytes, int],
+) -> tuple[list[list[bytes]], list[bytes]]:
+    """Distribute post-data statements between jobs.
+
+    Indexes and constraints are grouped by table, so they don't wait for each
+    other's locks, and groups are distributed between jobs starting with
+    biggest tables. Return statements of each job and the rest of statements,
+    which should be run afterwards in original order.
+
+    """
+    tables_statements: dict[bytes, list[bytes]] = collections.defaultdict(
+        list,
+    )
+    rest_statements: list[bytes] = []
+    for entry_type, statement in post_data_entries:
+        table_match = _POST_DATA_TABLE_REGEX.search(statement)
+        if entry_type not in _PARALLEL_POST_DATA_TYPES or not table_match:
+            rest_statements.append(statement)
+            continue
+        table = table_match["table"].replace(b'"', b"")
+        tables_statements[table].append(statement)
+    jobs_statements: list[list[bytes]] = [[] for _ in range(jobs)]
+    jobs_load = [0] * jobs
+    for table in sorted(
+        tables_statements,
+        key=lambda table: tables_data_size.get(table, 0),
+        reverse=True,
+    ):
+        job = jobs_load.index(min(jobs_load))
+        jobs_statements[job].extend(tables_statements[table])
+        jobs_load[job] += tables_data_size.get(table, 0) + 1
+    return jobs_statements, rest_statements
+
+
+def _copy_file_part(
+    source: typing.BinaryIO,
+    destination: typing.BinaryIO,
+    size: int,
+    chunk_size: int = 1024 * 1024,
+) -> None:
+    """Copy `size` bytes from current position of source to destination."""
+    while size > 0 and (chunk := source.read(min(size, chunk_size))):
+        destination.write(chunk)
+        size -= len(chunk)
+
+
+class _GrowingDumpReader:
+    """Stream of dump file which is still being written.
+
+    Used as `in_stream` of invoke, so it returns decoded chunks and blocks on
+    end of file until dump is complete.
+
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        is_complete: collections.abc.Callable[[], bool],
+    ) -> None:
+        self._path = path
+        self._is_complete = is_complete
+        self._file: typing.BinaryIO | None = None
+        self._is_read = False
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+
+    def read(self, size: int = -1) -> str:
+        """Read next chunk of dump.
+
+        `size` is ignored, since invoke requests single byte from streams
+        which are not terminals.
+
+        """
+        while not self._is_read:
+            # Check completeness before reading, so nothing written right
+            # after reading is lost
+            is_complete = self._is_complete()
+            if self._file is None and self._path.exists():
+                self._file = self._path.open(mode="rb")
+            data = b""
+            if self._file is not None:
+                data = self._file.read(_GROWING_DUMP_CHUNK_SIZE)
+            if data:
+                return self._decoder.decode(data)
+            if is_complete:
+                self._is_read = True
+                if self._file is not None:
+                    self._file.close()
+                return self._decoder.decode(b"", final=True)
+            time.sleep(0.1)
+        return ""
+
+
+def get_session_settings_env(settings: dict[str, str]) -> dict[str, str]:
+    """Get env which applies settings to libpq session.
+
+    Settings are applied only to the session of the command, so there is no
+    need to restore them afterwards.
+
+    """
+    if not settings:
+        return {}
+    options = " ".join(
+        f"-c {setting}={value}" for setting, value in settings.items()
+    )
+    return {
+        "PGOPTIONS": " ".join(
+            filter(None, (os.environ.get("PGOPTIONS"), options)),
+        ),
+    }
+
+
+@contextlib.contextmanager
+def temporary_passfile(
+    context: invoke.Context,
+    password: str,
+) -> collections.abc.Generator[str, typing.Any, None]:
+    """Create temporary password file for libpq and delete it afterwards.
+
+    https://www.postgresql.org/docs/current/libpq-pgpass.html
+
+    """
+    system.create_tmp_folder(context)
+    # mkstemp creates file readable only by owner, as libpq requires
+    file_descriptor, passfile = tempfile.mkstemp(dir=".tmp", prefix=".pgpass")
+    escaped_password = password.replace("\\", "\\\\").replace(":", "\\:")
+    with os.fdopen(file_descriptor, mode="w") as passfile_file:
+        passfile_file.write(f"*:*:*:*:{escaped_password}\n")
+    try:
+        yield passfile
+    finally:
+        pathlib.Path(passfile).unlink()
+
+
+@contextlib.contextmanager
+def get_credentials_env(
+    context: invoke.Context,
+    password: str,
+) -> collections.abc.Generator[dict[str, str], typing.Any, None]:
+    """Get env which passes password to libpq according to settings.
+
+    Empty env is returned for `prompt` mode, since password is answered to
+    prompt in such case.
+
+    """
+    config = _config.Config.from_context(context)
+    match config.db.credentials_mode:
+        case "env":
+            yield {"PGPASSWORD": password}
+        case "passfile":
+            with temporary_passfile(context, password) as passfile:
+                yield {"PGPASSFILE": passfile}
+        case _:
+            yield {}
+
+
+def run_with_password(
+    context: invoke.Context,
+    command: str,
+    password: str,
+    env: dict[str, str] | None = None,
+    **kwargs,
+) -> invoke.runners.Result | None:
+    """Run db command passing password according to settings.
+
+    In `prompt` mode password prompt is answered via watcher, in other modes
+    password is passed via env, so command doesn't need pty and its output
+    is not scanned.
+
+    """
+    config = _config.Config.from_context(context)
+    if config.db.credentials_mode == "prompt":
+        return context.run(
+            command,
+            env=env or {},
+            watchers=(
+                invoke.Responder(
+                    pattern=config.db.password_pattern,
+                    response=f"{password}\n",
+                ),
+            ),
+            **kwargs,
+        )
+    with get_credentials_env(context, password) as credentials_env:
+        return context.run(
+            command,
+            env={**(env or {}), **credentials_env},
+            pty=False,
+            **kwargs,
+        )
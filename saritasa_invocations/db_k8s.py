@@ -1,9 +1,36 @@
+import collections.abc
+import concurrent.futures
+import contextlib
 import datetime
+import io
+import json
 import pathlib
+import re
+import shlex
+import shutil
+import statistics
+import time
+import typing
 
 import invoke
+import rich.table
+import rich.text
 
-from . import _config, k8s
+from . import _config, db, k8s, printing, system
+
+_DATABASE_SIZE_QUERY = "SELECT pg_database_size(current_database())"
+_DATABASE_SIZE_REGEX = re.compile(r"^(?P<size>\d+)\r?$", flags=re.MULTILINE)
+# Operations which stats are recorded and tasks which perform them
+_DUMP_OPERATIONS = {
+    "dump": "create-dump",
+    "download": "get-dump",
+    "stream": "stream-dump",
+    "port-forward": "create-dump-via-port-forward",
+}
+# Reads password from stdin and runs db command (passed as args) with it
+_STDIN_CREDENTIALS_SCRIPT = (
+    'IFS= read -r PGPASSWORD && export PGPASSWORD && exec "$@"'
+)
 
 
 @invoke.task
@@ -18,7 +45,21 @@ def create_dump(
     additional_params: str = "",
 ) -> None:
     """Execute dump command in db pod."""
-    config = _config.Config.from_context(context)
+    additional_params = _add_auto_excluded_table_data_params(
+        context,
+        additional_params=additional_params
+        or _generate_dump_additional_params(context),
+        run_query=lambda command: _run_in_db_pod(
+            context,
+            command=command,
+            password=password,
+            hide="out",
+        ),
+        dbname=dbname,
+        host=host,
+        port=port,
+        username=username,
+    )
     command = _generate_dump_command(
         context,
         file=file,
@@ -28,17 +69,400 @@ def create_dump(
         username=username,
         additional_params=additional_params,
     )
-    k8s.success(context, f"Entering into db with {command}")
-    db_exec_command = _generate_exec_command(context)
-    context.run(
-        f"{db_exec_command} -- {command}",
-        watchers=(
-            invoke.Responder(
-                pattern=config.db.password_pattern,
-                response=f"{password}\n",
+    started_at = time.monotonic()
+    _run_in_db_pod(context, command=command, password=password)
+    seconds = time.monotonic() - started_at
+    db_config = k8s.get_current_env_config_from_context(context).db_config
+    filename = _get_db_k8s_dump_filename(context, file=file)
+    result = context.run(
+        f"{_generate_exec_command(context, non_interactive=True)} -- "
+        + db_config.dump_size_command.format(
+            file=f"{db_config.dump_dir}/{filename}",
+        ),
+        hide="out",
+        warn=True,
+    )
+    if result and result.ok:
+        _record_dump_stats(
+            context,
+            operation="dump",
+            size=int(result.stdout.split()[-1]),
+            seconds=seconds,
+        )
+
+
+@invoke.task
+def create_dump_via_port_forward(
+    context: invoke.Context,
+    dbname: str,
+    host: str,
+    port: str,
+    username: str,
+    password: str,
+    file: str = "",
+    jobs: int = 0,
+    additional_params: str = "",
+) -> str:
+    """Dump db locally in directory format via port-forward to db pod.
+
+    Unlike `create_dump`, pg_dump runs locally with `jobs` parallel workers
+    (`port_forward_dump_jobs` from settings by default), so db pod should
+    serve db on `port`. Port-forward is closed once dump is finished.
+
+    """
+    db_config = k8s.get_current_env_config_from_context(context).db_config
+    filename = _get_db_k8s_dump_filename(context, file=file, extension="dir")
+    db_settings = {
+        "dbname": dbname,
+        "host": "localhost",
+        "port": db_config.port_forward_local_port,
+        "username": username,
+    }
+    k8s.success(context, f"Forwarding db port {port} of pod")
+    with k8s.port_forward(
+        context,
+        pod_namespace=db_config.namespace,
+        get_pod_name_command=_generate_get_pod_name_command(context),
+        local_port=db_config.port_forward_local_port,
+        pod_port=port,
+        timeout=db_config.port_forward_timeout,
+    ):
+        additional_params = _add_auto_excluded_table_data_params(
+            context,
+            additional_params=additional_params
+            or _generate_dump_additional_params(context),
+            run_query=lambda command: db.run_with_password(
+                context,
+                command=command,
+                password=password,
+                hide="out",
             ),
+            **db_settings,
+        )
+        k8s.success(context, f"Dumping db into {filename}")
+        db.remove_dump_manifest(filename)
+        started_at = time.monotonic()
+        db.run_with_password(
+            context,
+            command=db_config.port_forward_dump_command.format(
+                additional_params=additional_params,
+                jobs=jobs or db_config.port_forward_dump_jobs,
+                file=filename,
+                **db_settings,
+            ),
+            password=password,
+        )
+    _record_dump_stats(
+        context,
+        operation="port-forward",
+        size=db.get_dump_size(filename),
+        seconds=time.monotonic() - started_at,
+    )
+    db.write_dump_manifest(
+        context,
+        file=filename,
+        env=k8s.get_current_env_config_from_context(context).name,
+        options=additional_params,
+    )
+    return filename
+
+
+@invoke.task(iterable=["root_tables"])
+def create_subset_dump(
+    context: invoke.Context,
+    dbname: str,
+    host: str,
+    port: str,
+    username: str,
+    password: str,
+    root_tables: collections.abc.Sequence[str],
+    percent: float = 100.0,
+    limit: int = 0,
+    file: str = "",
+) -> None:
+    """Execute subset dump commands in db pod.
+
+    Rows of `root_tables` are sampled by `percent` and/or `limit`, then all
+    rows they reference via foreign keys are added. Schema is dumped fully.
+
+    """
+    db_config = k8s.get_current_env_config_from_context(context).db_config
+    script = db.generate_subset_script(
+        root_tables=root_tables,
+        percent=percent,
+        limit=limit,
+    )
+    system.create_tmp_folder(context)
+    script_path = pathlib.Path(".tmp/subset.sql")
+    script_path.write_text(script)
+    script_path_in_pod = f"{db_config.dump_dir}/subset.sql"
+    k8s.upload_file_to_pod(
+        context,
+        pod_namespace=db_config.namespace,
+        get_pod_name_command=_generate_get_pod_name_command(context),
+        path_to_file=str(script_path),
+        path_to_where_save_file_in_pod=script_path_in_pod,
+    )
+    script_path.unlink()
+
+    filename = _get_db_k8s_dump_filename(context, file=file)
+    dump_path = f"{db_config.dump_dir}/{filename}"
+    db_settings = {
+        "dbname": dbname,
+        "host": host,
+        "port": port,
+        "username": username,
+    }
+    dump_params = _generate_dump_additional_params(context)
+    commands = (
+        _generate_dump_command(
+            context,
+            file=filename,
+            additional_params=f"{dump_params} --section=pre-data",
+            **db_settings,
+        ),
+        db_config.subset_command.format(
+            script=script_path_in_pod,
+            file=f"{dump_path}.data",
+            **db_settings,
+        ),
+        _generate_dump_command(
+            context,
+            file=f"{filename}.post-data",
+            additional_params=f"{dump_params} --section=post-data",
+            **db_settings,
+        ),
+    )
+    for command in commands:
+        _run_in_db_pod(context, command=command, password=password)
+    context.run(
+        f"{_generate_exec_command(context)} -- sh -c '"
+        f"cat {dump_path}.data {dump_path}.post-data >> {dump_path} && "
+        f"rm {dump_path}.data {dump_path}.post-data {script_path_in_pod}'",
+    )
+
+
+@invoke.task
+def stream_dump(
+    context: invoke.Context,
+    dbname: str,
+    host: str,
+    port: str,
+    username: str,
+    password: str,
+    file: str = "",
+    additional_params: str = "",
+) -> str:
+    """Stream plain dump from db pod into local file.
+
+    Unlike `create_dump` and `get_dump`, dump is not saved in db pod, so it
+    arrives while it's being made.
+
+    Since dump is streamed, password is never answered to prompt, it's passed
+    via `PGPASSWORD` in `prompt` mode of `credentials_mode`.
+
+    """
+    config = _config.Config.from_context(context)
+    db_config = k8s.get_current_env_config_from_context(context).db_config
+    filename = _get_db_k8s_dump_filename(context, file=file)
+    additional_params = _add_auto_excluded_table_data_params(
+        context,
+        additional_params=additional_params
+        or _generate_dump_additional_params(context),
+        run_query=lambda command: _run_in_db_pod(
+            context,
+            command=command,
+            password=password,
+            hide="out",
         ),
+        dbname=dbname,
+        host=host,
+        port=port,
+        username=username,
+    )
+    dump_command = db_config.stream_dump_command.format(
+        dbname=dbname,
+        host=host,
+        port=port,
+        username=username,
+        additional_params=additional_params,
+    )
+    k8s.success(context, f"Streaming dump from pod into {filename}")
+    db.remove_dump_manifest(filename)
+    started_at = time.monotonic()
+    with _get_db_pod_credentials(
+        context,
+        password=password,
+        credentials_mode=config.db.credentials_mode,
+    ) as (credentials_command, credentials_kwargs):
+        context.run(
+            f"{_generate_exec_command(context, non_interactive=True)} -- "
+            f"{credentials_command} {dump_command} > {filename}",
+            pty=False,
+            **credentials_kwargs,
+        )
+    _record_dump_stats(
+        context,
+        operation="stream",
+        size=db.get_dump_size(filename),
+        seconds=time.monotonic() - started_at,
+    )
+    db.write_dump_manifest(
+        context,
+        file=filename,
+        env=k8s.get_current_env_config_from_context(context).name,
+        options=additional_params,
+    )
+    k8s.success(context, f"Dump is streamed into {filename}")
+    return filename
+
+
+def load_dump_with_pipeline(
+    context: invoke.Context,
+    remote_db_settings: dict[str, str],
+    local_db_settings: dict[str, str],
+    reset_local_db: collections.abc.Callable[[], None],
+    file: str = "",
+    jobs: int = 0,
+) -> str:
+    """Dump remote db and load it into local db overlapping the steps.
+
+    Local db is reset with `reset_local_db` while remote db is dumped. Plain
+    dump is streamed from db pod and loaded while it arrives. If `jobs` is
+    set, dump is made via port-forward and restored with `jobs` parallel
+    workers once it's complete, since such dump can't be loaded partially.
+
+    """
+    # Commands are run concurrently, so none of them should read stdin
+    with (
+        _config.context_override(context, run={"in_stream": False}),
+        concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor,
+    ):
+        if jobs:
+            dump = executor.submit(
+                create_dump_via_port_forward,
+                context,
+                file=file,
+                jobs=jobs,
+                **remote_db_settings,
+            )
+            reset_local_db()
+            file = dump.result()
+            db.load_db_dump(
+                context,
+                file=file,
+                jobs=jobs,
+                # Dump has just been made by pg_dump, which exited fine
+                verify_manifest=False,
+                **local_db_settings,
+            )
+            return file
+        file = _get_db_k8s_dump_filename(context, file=file)
+        pathlib.Path(file).unlink(missing_ok=True)
+        dump = executor.submit(
+            stream_dump,
+            context,
+            file=file,
+            **remote_db_settings,
+        )
+        reset_local_db()
+        db.load_growing_db_dump(
+            context,
+            file=file,
+            is_complete=dump.done,
+            **local_db_settings,
+        )
+        # Raise error of dump if it failed
+        return dump.result()
+
+
+@invoke.task(iterable=["tables"])
+def sync_tables(
+    context: invoke.Context,
+    dbname: str,
+    host: str,
+    port: str,
+    username: str,
+    password: str,
+    local_dbname: str,
+    local_host: str,
+    local_port: str,
+    local_username: str,
+    local_password: str,
+    tables: collections.abc.Sequence[str],
+    where: str = "",
+    disable_triggers: bool = False,
+) -> None:
+    """Stream data of tables from db pod into local db.
+
+    Data of `tables` (filtered by `where` condition if set) is streamed with
+    `COPY` from db pod into local db without intermediate dump file. Local
+    tables are truncated and filled in single transaction, in order of
+    `tables`. Use `disable_triggers` to skip foreign key checks, it requires
+    superuser.
+
+    Since data is streamed, password is never answered to prompt, it's passed
+    via `PGPASSWORD` in `prompt` mode of `credentials_mode`.
+
+    """
+    config = _config.Config.from_context(context)
+    db_config = k8s.get_current_env_config_from_context(context).db_config
+    script = db.generate_sync_tables_script(tables=tables, where=where)
+    system.create_tmp_folder(context)
+    script_path = pathlib.Path(".tmp/sync_tables.sql")
+    script_path.write_text(script)
+    script_path_in_pod = f"{db_config.dump_dir}/sync_tables.sql"
+    k8s.upload_file_to_pod(
+        context,
+        pod_namespace=db_config.namespace,
+        get_pod_name_command=_generate_get_pod_name_command(context),
+        path_to_file=str(script_path),
+        path_to_where_save_file_in_pod=script_path_in_pod,
+    )
+    script_path.unlink()
+
+    env = db.get_session_settings_env(
+        {"session_replication_role": "replica"} if disable_triggers else {},
+    )
+    load_command = config.db.load_dump_command.format(
+        dbname=local_dbname,
+        host=local_host,
+        port=local_port,
+        username=local_username,
+        additional_params="--quiet --set ON_ERROR_STOP=1",
+        file="-",
+    )
+    k8s.success(context, f"Syncing tables: {', '.join(tables)}")
+    sync_command = db_config.sync_tables_command.format(
+        dbname=dbname,
+        host=host,
+        port=port,
+        username=username,
+        script=script_path_in_pod,
     )
+    exec_command = _generate_exec_command(context, non_interactive=True)
+    try:
+        with (
+            _get_db_pod_credentials(
+                context,
+                password=password,
+                credentials_mode=config.db.credentials_mode,
+            ) as (credentials_command, credentials_kwargs),
+            db.get_credentials_env(context, local_password) as local_env,
+        ):
+            context.run(
+                f"set -o pipefail; {exec_command} -- "
+                f"{credentials_command} {sync_command} | {load_command}",
+                env={
+                    **env,
+                    **(local_env or {"PGPASSWORD": local_password}),
+                },
+                pty=False,
+                **credentials_kwargs,
+            )
+    finally:
+        context.run(f"{exec_command} -- rm {script_path_in_pod}")
+    k8s.success(context, "Tables are synced")
 
 
 @invoke.task
@@ -46,12 +470,26 @@ def get_dump(
     context: invoke.Context,
     file: str = "",
 ) -> str:
-    """Download db data from db pod if it present."""
-    config = k8s.get_current_env_config_from_context(context).db_config
-    file = _get_db_k8s_dump_filename(context)
+    """Download db data from db pod if it present.
+
+    Manifest is written next to downloaded dump, download is checked against
+    size and sha256 of dump in db pod.
+
+    """
+    k8s_config = k8s.get_current_env_config_from_context(context)
+    config = k8s_config.db_config
+    file = _get_db_k8s_dump_filename(context, file=file)
 
-    k8s.success(context, f"Downloading dump ({file}) from pod")
     dump_path = f"{config.dump_dir}/{file}"
+    result = context.run(
+        f"{_generate_exec_command(context, non_interactive=True)} -- "
+        f"{config.dump_checksum_command.format(file=dump_path)}",
+        hide="out",
+    )
+    size, sha256 = result.stdout.split()[:2] if result else ("", "")
+    k8s.success(context, f"Downloading dump ({file}) from pod")
+    db.remove_dump_manifest(file)
+    started_at = time.monotonic()
     k8s.download_file_from_pod(
         context,
         pod_namespace=config.namespace,
@@ -59,11 +497,163 @@ def get_dump(
         path_to_file_in_pod=dump_path,
         path_to_where_save_file=f"{pathlib.Path.cwd()}/{file}",
     )
+    _record_dump_stats(
+        context,
+        operation="download",
+        size=int(size),
+        seconds=time.monotonic() - started_at,
+    )
+    db.write_dump_manifest(
+        context,
+        file=file,
+        env=k8s_config.name,
+        # Dump could be made with other params, but usually settings are used
+        options=_generate_dump_additional_params(context),
+        source_size=int(size),
+        source_sha256=sha256,
+    )
     k8s.success(context, f"Downloaded dump ({file}) from pod. Clean up")
     context.run(f"{_generate_exec_command(context)} -- rm {dump_path}")
     return file
 
 
+@invoke.task
+def estimate(
+    context: invoke.Context,
+    dbname: str,
+    host: str,
+    port: str,
+    username: str,
+    password: str,
+) -> None:
+    """Estimate size of dump, time and disk space needed to get it.
+
+    Sizes of db and its tables are queried in db pod (data of tables is
+    excluded according to settings), dump size and time are predicted from
+    stats of earlier dumps of env, which are recorded by dump tasks.
+
+    """
+    k8s_config = k8s.get_current_env_config_from_context(context)
+    db_config = k8s_config.db_config
+
+    def run_query(query: str) -> str:
+        result = _run_in_db_pod(
+            context,
+            command=db_config.table_sizes_command.format(
+                dbname=dbname,
+                host=host,
+                port=port,
+                username=username,
+                query=shlex.quote(query),
+            ),
+            password=password,
+            hide="out",
+        )
+        return result.stdout if result else ""
+
+    match = _DATABASE_SIZE_REGEX.search(run_query(_DATABASE_SIZE_QUERY))
+    database_size = int(match["size"]) if match else 0
+    table_sizes_output = run_query(
+        db.generate_table_sizes_query(db_config.dump_exclude_table_data_size),
+    )
+    kept_size, skipped_size = db.print_table_sizes_report(
+        db.get_table_sizes(
+            table_sizes_output=table_sizes_output,
+            patterns=db_config.dump_exclude_table_data_patterns,
+        ),
+    )
+    result = context.run(
+        f"{_generate_exec_command(context, non_interactive=True)} -- "
+        + db_config.free_disk_command.format(dir=db_config.dump_dir),
+        hide="out",
+        warn=True,
+    )
+    # Last line of `df -Pk` output contains available KB in 4th column
+    pod_free_space = (
+        int(result.stdout.splitlines()[-1].split()[3]) * 1024
+        if result and result.ok
+        else None
+    )
+    local_free_space = shutil.disk_usage(pathlib.Path.cwd()).free
+
+    stats = [
+        entry
+        for entry in _load_dump_stats(context)
+        if entry["env"] == k8s_config.name
+    ]
+    size_ratios = _get_dump_size_ratios(stats)
+    throughputs = {
+        operation: statistics.median(
+            entry["size"] / entry["seconds"]
+            for entry in stats
+            if entry["operation"] == operation and entry["seconds"] > 0
+        )
+        for operation in _DUMP_OPERATIONS
+        if any(entry["operation"] == operation for entry in stats)
+    }
+    report = rich.table.Table(
+        "Method",
+        "Dump size",
+        "Time",
+        "Pod disk",
+        "Local disk",
+        title=f"Dump estimate for {k8s_config.name}",
+    )
+    uses_default_ratio = False
+    for operations, pod_disk_is_used in (
+        (("dump", "download"), True),
+        (("stream",), False),
+        (("port-forward",), False),
+    ):
+        size_ratio = size_ratios.get(operations[0])
+        if size_ratio is None:
+            size_ratio = db_config.estimate_dump_size_ratio
+            uses_default_ratio = True
+        dump_size = int(kept_size * size_ratio)
+        time_cell = "unknown"
+        if all(operation in throughputs for operation in operations):
+            time_cell = str(
+                datetime.timedelta(
+                    seconds=round(
+                        sum(
+                            dump_size / throughputs[operation]
+                            for operation in operations
+                        ),
+                    ),
+                ),
+            )
+        report.add_row(
+            " + ".join(
+                _DUMP_OPERATIONS[operation] for operation in operations
+            ),
+            _format_size(dump_size)
+            + ("*" if operations[0] not in size_ratios else ""),
+            time_cell,
+            _format_disk_usage(dump_size, pod_free_space)
+            if pod_disk_is_used
+            else "-",
+            _format_disk_usage(dump_size, local_free_space),
+        )
+    report.caption = (
+        f"Db: {_format_size(database_size)}, "
+        f"data to dump: {_format_size(kept_size)}, "
+        f"skipped: {_format_size(skipped_size)}. "
+        f"Loading dump needs about {_format_size(kept_size)} more in local db"
+    )
+    if uses_default_ratio:
+        report.caption += (
+            ". * dump size is predicted with `estimate_dump_size_ratio`, "
+            "since there are no stats of earlier dumps"
+        )
+    printing.print_success(report)
+    _record_dump_stats(
+        context,
+        operation="estimate",
+        size=kept_size,
+        seconds=0,
+    )
+
+
 def _generate_get_pod_name_command(context: invoke.Context) -> str:
     """Generate pod command for db."""
     config = k8s.get_current_env_config_from_context(context).db_config
@@ -73,15 +663,100 @@ def _generate_get_pod_name_command(context: invoke.Context) -> str:
     )
 
 
-def _generate_exec_command(context: invoke.Context) -> str:
+def _generate_exec_command(
+    context: invoke.Context,
+    non_interactive: bool = False,
+) -> str:
     """Generate exec command for db."""
     config = k8s.get_current_env_config_from_context(context).db_config
-    return config.exec_command.format(
+    exec_command = config.exec_command
+    if non_interactive:
+        exec_command = config.non_interactive_exec_command
+    return exec_command.format(
         db_pod_namespace=config.namespace,
         db_pod=_generate_get_pod_name_command(context),
     )
 
 
+def _run_in_db_pod(
+    context: invoke.Context,
+    command: str,
+    password: str,
+    **kwargs,
+) -> invoke.runners.Result | None:
+    """Run db command in db pod passing password according to settings.
+
+    In `prompt` mode password prompt is answered via watcher, in other modes
+    password is passed via env, so command doesn't need tty and its output
+    is not scanned.
+
+    """
+    config = _config.Config.from_context(context)
+    k8s.success(context, f"Entering into db with {command}")
+    if config.db.credentials_mode == "prompt":
+        return context.run(
+            f"{_generate_exec_command(context)} -- {command}",
+            watchers=(
+                invoke.Responder(
+                    pattern=config.db.password_pattern,
+                    response=f"{password}\n",
+                ),
+            ),
+            **kwargs,
+        )
+    with _get_db_pod_credentials(
+        context,
+        password=password,
+        credentials_mode=config.db.credentials_mode,
+    ) as (credentials_command, credentials_kwargs):
+        return context.run(
+            f"{_generate_exec_command(context, non_interactive=True)} -- "
+            f"{credentials_command} {command}",
+            pty=False,
+            **credentials_kwargs,
+            **kwargs,
+        )
+
+
+@contextlib.contextmanager
+def _get_db_pod_credentials(
+    context: invoke.Context,
+    password: str,
+    credentials_mode: str,
+) -> collections.abc.Generator[tuple[str, dict[str, typing.Any]], None, None]:
+    """Get command and run kwargs which pass password to db command in pod.
+
+    In `passfile` mode temporary passfile is uploaded to db pod and removed
+    afterwards, in other modes password is sent to stdin of `kubectl exec`
+    and exported as `PGPASSWORD` in db pod, so it's not exposed in command
+    line of local or pod processes.
+
+    """
+    if credentials_mode != "passfile":
+        yield (
+            f"sh -c {shlex.quote(_STDIN_CREDENTIALS_SCRIPT)} sh",
+            {"in_stream": io.StringIO(f"{password}\n")},
+        )
+        return
+    db_config = k8s.get_current_env_config_from_context(context).db_config
+    passfile_in_pod = f"{db_config.dump_dir}/.pgpass"
+    with db.temporary_passfile(context, password) as passfile:
+        k8s.upload_file_to_pod(
+            context,
+            pod_namespace=db_config.namespace,
+            get_pod_name_command=_generate_get_pod_name_command(context),
+            path_to_file=passfile,
+            path_to_where_save_file_in_pod=passfile_in_pod,
+        )
+    try:
+        yield f"env PGPASSFILE={passfile_in_pod}", {}
+    finally:
+        context.run(
+            f"{_generate_exec_command(context, non_interactive=True)} -- "
+            f"rm {passfile_in_pod}",
+        )
+
+
 def _generate_dump_command(
     context: invoke.Context,
     dbname: str,
@@ -97,6 +772,20 @@ def _generate_dump_command(
         context,
         file=file,
     )
+    return config.dump_command.format(
+        dbname=dbname,
+        host=host,
+        port=port,
+        username=username,
+        file=f"{config.dump_dir}/{filename}",
+        additional_params=additional_params
+        or _generate_dump_additional_params(context),
+    )
+
+
+def _generate_dump_additional_params(context: invoke.Context) -> str:
+    """Generate additional params for remote dump command from settings."""
+    config = k8s.get_current_env_config_from_context(context).db_config
     additional_params_list = [
         config.dump_additional_params,
     ]
@@ -120,20 +809,57 @@ def _generate_dump_command(
         additional_params_list.append(
             f"--exclude-extension={config.dump_exclude_extension}",
         )
-    return config.dump_command.format(
-        dbname=dbname,
-        host=host,
-        port=port,
-        username=username,
-        file=f"{config.dump_dir}/{filename}",
-        additional_params=additional_params
-        or " ".join(additional_params_list),
+    return " ".join(additional_params_list)
+
+
+def _add_auto_excluded_table_data_params(
+    context: invoke.Context,
+    additional_params: str,
+    run_query: collections.abc.Callable[[str], invoke.runners.Result | None],
+    dbname: str,
+    host: str,
+    port: str,
+    username: str,
+) -> str:
+    """Add params excluding table data by size or pattern from settings.
+
+    `run_query` is used to run command which lists sizes of tables.
+
+    """
+    db_config = k8s.get_current_env_config_from_context(context).db_config
+    if not (
+        db_config.dump_exclude_table_data_size
+        or db_config.dump_exclude_table_data_patterns
+    ):
+        return additional_params
+    result = run_query(
+        db_config.table_sizes_command.format(
+            dbname=dbname,
+            host=host,
+            port=port,
+            username=username,
+            query=shlex.quote(
+                db.generate_table_sizes_query(
+                    db_config.dump_exclude_table_data_size,
+                ),
+            ),
+        ),
+    )
+    return " ".join(
+        (
+            additional_params,
+            *db.generate_exclude_table_data_params(
+                table_sizes_output=result.stdout if result else "",
+                patterns=db_config.dump_exclude_table_data_patterns,
+            ),
+        ),
     )
 
 
 def _get_db_k8s_dump_filename(
     context: invoke.Context,
     file: str = "",
+    extension: str = "sql",
 ) -> str:
     """Get filename for db dump."""
     config = _config.Config.from_context(context)
@@ -143,6 +869,91 @@ def _get_db_k8s_dump_filename(
         project_name=config.project_name,
         env=k8s_config.name,
         timestamp=datetime.datetime.now(tz=datetime.timezone.utc),
-        extension="sql",
+        extension=extension,
     )
     return file or generated_filename
+
+
+def _load_dump_stats(context: invoke.Context) -> list[dict[str, typing.Any]]:
+    """Load stats of earlier dumps."""
+    db_config = k8s.get_current_env_config_from_context(context).db_config
+    stats_path = pathlib.Path(db_config.dump_stats_file)
+    if not stats_path.exists():
+        return []
+    return json.loads(stats_path.read_text())
+
+
+def _record_dump_stats(
+    context: invoke.Context,
+    operation: str,
+    size: int,
+    seconds: float,
+) -> None:
+    """Record size and duration of dump operation for `estimate`.
+
+    Only last `dump_stats_history_size` records are kept.
+
+    """
+    k8s_config = k8s.get_current_env_config_from_context(context)
+    db_config = k8s_config.db_config
+    stats = _load_dump_stats(context)
+    stats.append(
+        {
+            "env": k8s_config.name,
+            "operation": operation,
+            "size": size,
+            "seconds": round(seconds, 3),
+            "created_at": datetime.datetime.now(
+                tz=datetime.timezone.utc,
+            ).isoformat(timespec="seconds"),
+        },
+    )
+    stats_path = pathlib.Path(db_config.dump_stats_file)
+    stats_path.parent.mkdir(parents=True, exist_ok=True)
+    stats_path.write_text(
+        json.dumps(stats[-db_config.dump_stats_history_size :], indent=2),
+    )
+
+
+def _get_dump_size_ratios(
+    stats: collections.abc.Sequence[dict[str, typing.Any]],
+) -> dict[str, float]:
+    """Get ratios of dump size to size of dumped table data by operations.
+
+    Size of dump is compared with size of table data from latest `estimate`
+    run before dump.
+
+    """
+    ratios = collections.defaultdict(list)
+    estimated_size = 0
+    for entry in stats:
+        if entry["operation"] == "estimate":
+            estimated_size = entry["size"]
+        elif entry["operation"] != "download" and estimated_size:
+            ratios[entry["operation"]].append(entry["size"] / estimated_size)
+    return {
+        operation: statistics.median(operation_ratios)
+        for operation, operation_ratios in ratios.items()
+    }
+
+
+def _format_size(size: float) -> str:
+    """Format size in bytes in human readable way."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def _format_disk_usage(
+    size: int,
+    free_space: int | None,
+) -> rich.text.Text | str:
+    """Format needed disk space, highlight it if free space is not enough."""
+    if free_space is None:
+        return _format_size(size)
+    text = f"{_format_size(size)} of {_format_size(free_space)} free"
+    if size > free_space:
+        return rich.text.Text(text, style="red")
+    return text
@@ -1,15 +1,46 @@
+import collections
 import collections.abc
+import concurrent.futures
 import contextlib
+import functools
+import hashlib
+import json
 import os
 import pathlib
 import re
+import shlex
+import socket
+import sys
+import time
+import typing
 import urllib.parse
 
 import invoke
 import rich.console
 import rich.text
 
-from . import _config, db, db_k8s, docker, k8s, printing, python, system
+from . import (
+    _command_server,
+    _config,
+    db,
+    db_k8s,
+    docker,
+    k8s,
+    printing,
+    python,
+    system,
+)
+
+_COMMAND_SERVER_SCRIPT = (
+    pathlib.Path(__file__).parent / "_django_command_server.py"
+)
+_BOOTSTRAP_SCRIPT = pathlib.Path(__file__).parent / "_django_bootstrap.py"
+_PROFILER_SCRIPT = pathlib.Path(__file__).parent / "_django_profiler.py"
+_TEST_DB_TEMPLATE_SCRIPT = (
+    pathlib.Path(__file__).parent / "_django_test_db_template.py"
+)
+# makemessages updates this header of all .po files on each run
+_POT_CREATION_DATE_PREFIX = b'"POT-Creation-Date:'
 
 
 @invoke.task
@@ -18,27 +49,72 @@ def wait_for_database(context: invoke.Context) -> None:
 
     Function called just once during subsequent calls of management commands.
 
-    Requires django_probes:
+    Database from django settings is probed right from invoke with
+    PostgreSQL startup handshake. Readiness is remembered in marker file for
+    `wait_for_database_marker_lifetime` seconds, so following invocations
+    skip the check. If django settings can't be loaded (for any reason, like
+    missing env variable) or db host can't be resolved (for example, it's
+    docker service name), `wait_for_database` management command is used.
+
+    Requires django_probes for fallback:
         https://github.com/painless-software/django-probes#basic-usage
 
     """
     config = _config.Config.from_context(context)
     if hasattr(wait_for_database, "_called"):
         return
+    marker = pathlib.Path(config.django.wait_for_database_marker_file)
+    if (
+        marker.exists()
+        and time.time() - marker.stat().st_mtime
+        < config.django.wait_for_database_marker_lifetime
+    ):
+        wait_for_database._called = True  # type: ignore
+        return
     docker.up(context)
-    # Not using manage to avoid infinite loop
-    python.run(
-        context,
-        command=(
-            f"{config.django.manage_file_path} wait_for_database --stable 0"
-        ),
-        env={
-            "DJANGO_SETTINGS_MODULE": config.django.settings_path,
-        },
-    )
+    if not _probe_database(context):
+        # Not using manage to avoid infinite loop
+        python.run(
+            context,
+            command=(
+                f"{config.django.manage_file_path} wait_for_database "
+                "--stable 0"
+            ),
+            env={
+                "DJANGO_SETTINGS_MODULE": config.django.settings_path,
+            },
+        )
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    marker.touch()
     wait_for_database._called = True  # type: ignore
 
 
+def _probe_database(context: invoke.Context) -> bool:
+    """Wait for db from django settings right from invoke.
+
+    `False` is returned if django settings can't be loaded (any error of
+    settings is left for `wait_for_database` command to report) or db host
+    can't be resolved.
+
+    """
+    config = _config.Config.from_context(context)
+    try:
+        db_settings = load_django_db_settings(context)
+    except Exception:  # noqa: BLE001
+        return False
+    try:
+        db.wait_for_connection(
+            host=db_settings["host"],
+            port=db_settings["port"],
+            dbname=db_settings["dbname"],
+            username=db_settings["username"],
+            timeout=config.django.wait_for_database_timeout,
+        )
+    except OSError:
+        return False
+    return True
+
+
 @invoke.task
 def manage(
     context: invoke.Context,
@@ -51,6 +127,9 @@ def manage(
     This command also handle starting of required services and waiting DB to
     be ready.
 
+    If command server is running (see `command_server`), command is sent to
+    it, unless command needs watchers, docker params or terminal.
+
     Args:
     ----
         context: Invoke context
@@ -62,6 +141,14 @@ def manage(
     """
     config = _config.Config.from_context(context)
     wait_for_database(context)
+    if (
+        not watchers
+        and not docker_params
+        and command.split(maxsplit=1)[0]
+        not in config.django.command_server_excluded_commands
+        and _is_command_server_running(context)
+    ):
+        return _run_command_via_server(context, command=command)
     return python.run(
         context,
         docker_params=docker_params,
@@ -73,6 +160,138 @@ def manage(
     )
 
 
+@invoke.task
+def command_server(context: invoke.Context) -> None:
+    """Run server which runs management commands without Django restart.
+
+    Django is set up once and each command sent by `manage` over unix socket
+    is run in forked process. Server runs until it's stopped by
+    `stop_command_server` or Ctrl+C. Restart it after changing code of
+    project. Composite tasks (like `resetdb`) start server for their duration
+    if it's not running.
+
+    """
+    _prepare_command_server(context)
+    _run_command_server(context)
+
+
+@invoke.task
+def stop_command_server(context: invoke.Context) -> None:
+    """Stop server which runs management commands."""
+    if not _is_command_server_running(context):
+        printing.print_warn("Command server is not running")
+        return
+    config = _config.Config.from_context(context)
+    _command_server.stop(config.django.command_server_socket)
+    printing.print_success("Command server is stopped")
+
+
+@contextlib.contextmanager
+def running_command_server(
+    context: invoke.Context,
+) -> collections.abc.Generator[None, None, None]:
+    """Run command server in background unless it's running already.
+
+    Server is not used if `use_command_server` is disabled, python env is
+    not local (socket of server in container is usually not reachable from
+    host) or platform doesn't support unix sockets and fork.
+
+    """
+    config = _config.Config.from_context(context)
+    if (
+        not config.django.use_command_server
+        or python.get_python_env() != python.PythonEnv.LOCAL
+        or not hasattr(socket, "AF_UNIX")
+        or not hasattr(os, "fork")
+        or _is_command_server_running(context)
+    ):
+        yield
+        return
+    wait_for_database(context)
+    _prepare_command_server(context)
+    printing.print_success("Starting command server")
+    promise = _command_server.start(
+        run_server=functools.partial(_run_command_server, context),
+        socket_path=config.django.command_server_socket,
+        timeout=config.django.command_server_start_timeout,
+    )
+    if promise is None:
+        yield
+        return
+    try:
+        yield
+    finally:
+        _command_server.stop(config.django.command_server_socket)
+        promise.join()
+
+
+def _prepare_command_server(context: invoke.Context) -> None:
+    """Copy command server script into project."""
+    config = _config.Config.from_context(context)
+    _command_server.copy_script(
+        _COMMAND_SERVER_SCRIPT,
+        config.django.command_server_script,
+    )
+
+
+def _run_command_server(
+    context: invoke.Context,
+    **kwargs,
+) -> invoke.runners.Result | invoke.runners.Promise | None:
+    """Run command server with project python interpreter."""
+    config = _config.Config.from_context(context)
+    return _run_django_python(
+        context,
+        command=(
+            f"{config.django.command_server_script} "
+            f"{config.django.command_server_socket}"
+        ),
+        **kwargs,
+    )
+
+
+def _run_django_python(
+    context: invoke.Context,
+    command: str,
+    **kwargs,
+) -> invoke.runners.Result | invoke.runners.Promise | None:
+    """Run python command with django settings passing kwargs to run."""
+    config = _config.Config.from_context(context)
+    run_kwargs = {
+        "command": command,
+        **kwargs,
+        "env": {
+            "DJANGO_SETTINGS_MODULE": config.django.settings_path,
+            **kwargs.get("env", {}),
+        },
+    }
+    if python.get_python_env() == python.PythonEnv.DOCKER:
+        return python.run_docker_python(context, **run_kwargs)
+    return python.run_local_python(context, **run_kwargs)
+
+
+def _is_command_server_running(context: invoke.Context) -> bool:
+    """Check that command server accepts connections."""
+    config = _config.Config.from_context(context)
+    return _command_server.is_running(config.django.command_server_socket)
+
+
+def _run_command_via_server(
+    context: invoke.Context,
+    command: str,
+    hide: bool = False,
+) -> invoke.runners.Result:
+    """Run management command via command server and stream its output."""
+    config = _config.Config.from_context(context)
+    return _command_server.run_command(
+        context,
+        socket_path=config.django.command_server_socket,
+        command=f"manage.py {command}",
+        args=shlex.split(command),
+        hide=hide,
+    )
+
+
 @invoke.task
 def makemigrations(context: invoke.Context) -> None:
     """Run makemigrations command and chown created migrations."""
@@ -122,6 +341,44 @@ def migrate(context: invoke.Context) -> None:
     manage(context, command=config.django.migrate_command)
 
 
+@invoke.task
+def prepare_test_databases(context: invoke.Context, workers: int = 0) -> None:
+    """Clone test databases from template built from migrations.
+
+    Template is built only when migration files change, then test database
+    is cloned from it for each pytest-xdist worker (`test_<db>_gw<N>`) or
+    once if `workers` is not set. Test run should reuse prepared databases
+    (`--reuse-db` of pytest-django, `--keepdb` of django test runner).
+
+    Only PostgreSQL is supported.
+
+    """
+    config = _config.Config.from_context(context)
+    wait_for_database(context)
+    printing.print_success("Django: Prepare test databases")
+    migrations_hash = hashlib.sha256()
+    for path in _iterate_project_files(
+        context,
+        patterns=config.django.migrations_patterns,
+    ):
+        migrations_hash.update(path.as_posix().encode())
+        migrations_hash.update(path.read_bytes())
+    _command_server.copy_script(
+        _TEST_DB_TEMPLATE_SCRIPT,
+        config.django.test_db_template_script,
+    )
+    _run_django_python(
+        context,
+        command=shlex.join(
+            (
+                config.django.test_db_template_script,
+                migrations_hash.hexdigest()[:12],
+                *(f"_gw{worker}" for worker in range(workers)),
+            ),
+        ),
+    )
+
+
 @invoke.task
 def resetdb(
     context: invoke.Context,
@@ -129,19 +386,27 @@ def resetdb(
 ) -> None:
     """Reset database to initial state (including test DB).
 
+    If `resetdb_bootstrap` is set, whole sequence is run in one Django
+    process (see `_bootstrap_resetdb`).
+
     Requires django-extensions:
         https://django-extensions.readthedocs.io/en/latest/installation_instructions.html
 
     """
     printing.print_success("Reset database to its initial state")
-    manage(context, command="drop_test_database --noinput")
-    manage(context, command="reset_db -c --noinput")
-    if not apply_migrations:
+    config = _config.Config.from_context(context)
+    if config.django.resetdb_bootstrap:
+        _bootstrap_resetdb(context, apply_migrations=apply_migrations)
         return
-    makemigrations(context)
-    migrate(context)
-    createsuperuser(context)
-    set_default_site(context)
+    with running_command_server(context):
+        manage(context, command="drop_test_database --noinput")
+        manage(context, command="reset_db -c --noinput")
+        if not apply_migrations:
+            return
+        makemigrations(context)
+        migrate(context)
+        createsuperuser(context)
+        set_default_site(context)
 
 
 @invoke.task
@@ -153,41 +418,22 @@ def createsuperuser(
 ) -> None:
     """Create superuser."""
     config = _config.Config.from_context(context)
-    email_source = "cmd"
-    username_source = "cmd"
-    if not email:
-        with contextlib.suppress(invoke.Failure):
-            output = context.run(
-                "git config user.email",
-                echo=False,
-                hide="out",
-            )
-            if output and (email := output.stdout.replace(" ", "").strip()):
-                email_source = "git"
-        if not email:
-            email = config.django.default_superuser_email
-            email_source = "config"
-    if not username:
-        with contextlib.suppress(invoke.Failure):
-            output = context.run(
-                "git config user.name",
-                echo=False,
-                hide="out",
-            )
-            if output and (username := output.stdout.replace(" ", "").strip()):
-                username_source = "git"
-        if not username:
-            username = config.django.default_superuser_username
-            username_source = "config"
-    if not password:
-        password = config.django.default_superuser_password
-
-    printing.print_success(
-        "Django: Creating superuser with the following ->\n"
-        f"{email=} from {email_source}\n"
-        f"{username=} from {username_source}",
+    email, username, password = _get_superuser_credentials(
+        context,
+        email=email,
+        username=username,
+        password=password,
     )
 
+    if config.django.createsuperuser_credentials_mode == "env":
+        _createsuperuser_from_env(
+            context,
+            email=email,
+            username=username,
+            password=password,
+        )
+        return
+
     responder_email = invoke.FailingResponder(
         pattern=rf"{config.django.verbose_email_name}.*: ",
         response=f"{email}\n",
@@ -218,6 +464,190 @@ def createsuperuser(
         )
 
 
+def _get_superuser_credentials(
+    context: invoke.Context,
+    email: str = "",
+    username: str = "",
+    password: str = "",
+) -> tuple[str, str, str]:
+    """Get email, username and password for superuser.
+
+    Not specified email and username are taken from git identity, then
+    from config. Both git lookups are run at the same time.
+
+    """
+    config = _config.Config.from_context(context)
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        git_email = (
+            executor.submit(_get_git_config, context, "user.email")
+            if not email
+            else None
+        )
+        git_username = (
+            executor.submit(_get_git_config, context, "user.name")
+            if not username
+            else None
+        )
+        email, email_source = _pick_superuser_value(
+            email,
+            git_email,
+            config.django.default_superuser_email,
+        )
+        username, username_source = _pick_superuser_value(
+            username,
+            git_username,
+            config.django.default_superuser_username,
+        )
+    printing.print_success(
+        "Django: Creating superuser with the following ->\n"
+        f"{email=} from {email_source}\n"
+        f"{username=} from {username_source}",
+    )
+    return (
+        email,
+        username,
+        password or config.django.default_superuser_password,
+    )
+
+
+def _get_git_config(context: invoke.Context, key: str) -> str:
+    """Get value of git config key without spaces."""
+    with contextlib.suppress(invoke.Failure):
+        output = context.run(
+            f"git config {key}",
+            echo=False,
+            hide="out",
+        )
+        if output:
+            return output.stdout.replace(" ", "").strip()
+    return ""
+
+
+def _pick_superuser_value(
+    value: str,
+    git_value: concurrent.futures.Future[str] | None,
+    default: str,
+) -> tuple[str, str]:
+    """Pick superuser value and its source: cmd, git or config."""
+    if value or not git_value:
+        return value, "cmd"
+    if git_value_result := git_value.result():
+        return git_value_result, "git"
+    return default, "config"
+
+
+def _bootstrap_resetdb(
+    context: invoke.Context,
+    apply_migrations: bool,
+) -> None:
+    """Reset database in one Django process.
+
+    Instead of running `drop_test_database`, `reset_db`, `makemigrations`,
+    `migrate`, `createsuperuser` and `set_default_site` as separate
+    processes, they are run by bootstrap script with `call_command`.
+    Dropping of test database is run at the same time with steps following
+    `reset_db` and git identity is resolved while database is awaited.
+    Superuser data is passed via `DJANGO_SUPERUSER_*` env vars.
+
+    """
+    config = _config.Config.from_context(context)
+    steps: list[dict[str, typing.Any]] = [
+        {"args": ["reset_db", "-c", "--noinput"]},
+        # Both commands connect to `template1`, which blocks creation of
+        # database from it, so test database is dropped after reset
+        {"args": ["drop_test_database", "--noinput"], "background": True},
+    ]
+    env = {}
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        credentials = (
+            executor.submit(_get_superuser_credentials, context)
+            if apply_migrations
+            else None
+        )
+        wait_for_database(context)
+        if credentials:
+            email, username, password = credentials.result()
+            env = {
+                "DJANGO_SUPERUSER_EMAIL": email,
+                "DJANGO_SUPERUSER_USERNAME": username,
+                "DJANGO_SUPERUSER_PASSWORD": password,
+            }
+            steps.extend(
+                (
+                    {"args": ["makemigrations"]},
+                    {"args": shlex.split(config.django.migrate_command)},
+                    {
+                        "args": ["createsuperuser", "--noinput"],
+                        "optional": True,
+                    },
+                    {
+                        "args": [
+                            "set_default_site",
+                            "--name=localhost:8000",
+                            "--domain=localhost:8000",
+                        ],
+                    },
+                ),
+            )
+    plan = {"steps": steps}
+    _command_server.copy_script(
+        _BOOTSTRAP_SCRIPT,
+        config.django.bootstrap_script,
+    )
+    with _config.context_override(
+        context,
+        run={"pty": False},
+    ) as no_pty_context:
+        _run_django_python(
+            no_pty_context,
+            command=(
+                f"{config.django.bootstrap_script} "
+                f"{shlex.quote(json.dumps(plan))}"
+            ),
+            env=env,
+        )
+    if apply_migrations and python.get_python_env() == python.PythonEnv.DOCKER:
+        system.chown(context)
+
+
+def _createsuperuser_from_env(
+    context: invoke.Context,
+    email: str,
+    username: str,
+    password: str,
+) -> None:
+    """Create superuser passing its data via `DJANGO_SUPERUSER_*` env vars.
+
+    Command is run with `--noinput`, so it doesn't need pty and its output
+    is not scanned for prompts.
+
+    """
+    config = _config.Config.from_context(context)
+    wait_for_database(context)
+    try:
+        with _config.context_override(
+            context,
+            run={"pty": False},
+        ) as no_pty_context:
+            python.run(
+                no_pty_context,
+                command=(
+                    f"{config.django.manage_file_path} "
+                    "createsuperuser --noinput"
+                ),
+                env={
+                    "DJANGO_SETTINGS_MODULE": config.django.settings_path,
+                    "DJANGO_SUPERUSER_EMAIL": email,
+                    "DJANGO_SUPERUSER_USERNAME": username,
+                    "DJANGO_SUPERUSER_PASSWORD": password,
+                },
+            )
+    except invoke.Failure:
+        printing.print_warn(
+            "Superuser with that email already exists. Skipped.",
+        )
+
+
 @invoke.task
 def run(context: invoke.Context) -> None:
     """Run development web-server."""
@@ -265,56 +695,337 @@ def dbshell(context: invoke.Context) -> None:
 
 
 @invoke.task
-def recompile_messages(context: invoke.Context) -> None:
+def profile(
+    context: invoke.Context,
+    command: str,
+    sort: str = "",
+    limit: int = 0,
+) -> None:
+    """Run management command under cProfile.
+
+    Count and total time of SQL queries are captured via `execute_wrapper`.
+    Sorted report and `.pstats` file (can be viewed with `snakeviz` or
+    `python -m pstats`) are saved into `profile_dir`.
+
+    """
+    config = _config.Config.from_context(context)
+    wait_for_database(context)
+    args = shlex.split(command)
+    if not args:
+        raise invoke.Exit(
+            code=1,
+            message="Command to profile is not specified",
+        )
+    output_prefix = (
+        pathlib.Path(config.django.profile_dir)
+        / f"{args[0]}-{time.strftime('%Y%m%d-%H%M%S', time.gmtime())}"
+    ).as_posix()
+    printing.print_success(f"Django: Profiling `{command}`")
+    _command_server.copy_script(_PROFILER_SCRIPT, config.django.profile_script)
+    _run_django_python(
+        context,
+        command=shlex.join(
+            (
+                config.django.profile_script,
+                output_prefix,
+                sort or config.django.profile_sort,
+                str(limit or config.django.profile_limit),
+                *args,
+            ),
+        ),
+    )
+
+
+@invoke.task
+def recompile_messages(context: invoke.Context, force: bool = False) -> None:
     """Generate and recompile translation messages.
 
     https://docs.djangoproject.com/en/4.2/ref/django-admin/#makemessages
 
+    Hashes of sources and `.po` files are cached, so `makemessages` is
+    skipped if sources haven't changed and only locales which `.po` files
+    have changed are compiled (in parallel). If any source has changed,
+    `makemessages` is run for whole project, since `.po` files can be shared
+    by apps (sources are hashed per app only to report changed ones). Use
+    `force` to ignore cache.
+
     """
     printing.print_success("Recompiling translation messages")
     config = _config.Config.from_context(context)
-    manage(
-        context,
-        command=f"makemessages {config.django.makemessages_params}",
+    cache_path = pathlib.Path(config.django.messages_cache_file)
+    cache: dict[str, dict[str, str]] = {"sources": {}, "po": {}}
+    if cache_path.exists() and not force:
+        cache = json.loads(cache_path.read_text())
+    source_hashes = _hash_messages_sources(context)
+    changed_apps = sorted(
+        app
+        for app in source_hashes.keys() | cache["sources"].keys()
+        if source_hashes.get(app) != cache["sources"].get(app)
     )
-    manage(
-        context,
-        command=f"compilemessages {config.django.compilemessages_params}",
+    # Server is started only if any command is going to be run
+    with contextlib.ExitStack() as command_server:
+        if changed_apps:
+            command_server.enter_context(running_command_server(context))
+            printing.print_success(
+                f"Sources of {', '.join(changed_apps)} have changed",
+            )
+            manage(
+                context,
+                command=f"makemessages {config.django.makemessages_params}",
+            )
+        else:
+            printing.print_success(
+                "Sources haven't changed, skipping makemessages",
+            )
+        po_hashes = _hash_po_files(context)
+        changed_locales = sorted(
+            {
+                po_path.parent.parent.name
+                for po_path in map(pathlib.Path, po_hashes)
+                if po_hashes[str(po_path)] != cache["po"].get(str(po_path))
+                or not po_path.with_suffix(".mo").exists()
+            },
+        )
+        if changed_locales:
+            # Nothing is done if server is started already
+            command_server.enter_context(running_command_server(context))
+            printing.print_success(
+                f"Compiling messages of {', '.join(changed_locales)}",
+            )
+            _compile_messages(context, locales=changed_locales)
+        else:
+            printing.print_success(
+                "Messages haven't changed, skipping compilemessages",
+            )
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(
+        json.dumps({"sources": source_hashes, "po": po_hashes}, indent=2),
     )
 
 
+def _compile_messages(
+    context: invoke.Context,
+    locales: collections.abc.Sequence[str],
+) -> None:
+    """Run compilemessages for locales in parallel."""
+    config = _config.Config.from_context(context)
+    # Wait for db once, not in each thread
+    wait_for_database(context)
+    # Commands are run concurrently, so none of them should read stdin
+    with (
+        _config.context_override(context, run={"in_stream": False}),
+        concurrent.futures.ThreadPoolExecutor(
+            max_workers=config.django.compilemessages_jobs or os.cpu_count(),
+        ) as executor,
+    ):
+        for future in [
+            executor.submit(
+                manage,
+                context,
+                command=(
+                    f"compilemessages {config.django.compilemessages_params} "
+                    f"--locale={locale}"
+                ),
+            )
+            for locale in locales
+        ]:
+            future.result()
+
+
+def _iterate_project_files(
+    context: invoke.Context,
+    patterns: collections.abc.Iterable[str],
+) -> collections.abc.Iterator[pathlib.Path]:
+    """Iterate over project files matching patterns except ignored dirs."""
+    config = _config.Config.from_context(context)
+    ignored_dirs = set(config.django.project_ignored_dirs)
+    for root, dirs, files in os.walk("."):
+        dirs[:] = sorted(set(dirs) - ignored_dirs)
+        for file in sorted(files):
+            path = pathlib.Path(root, file)
+            if any(path.match(pattern) for pattern in patterns):
+                yield path
+
+
+def _hash_messages_sources(context: invoke.Context) -> dict[str, str]:
+    """Hash sources of translation messages per app to report changed ones.
+
+    Files outside of `apps_path` are grouped as `project`.
+
+    """
+    config = _config.Config.from_context(context)
+    apps_path = pathlib.Path(config.django.apps_path)
+    hashes: dict[str, typing.Any] = {}
+    for path in _iterate_project_files(
+        context,
+        patterns=config.django.messages_source_patterns,
+    ):
+        relative_parts = (
+            path.parts[len(apps_path.parts) :]
+            if path.is_relative_to(apps_path)
+            else ()
+        )
+        app = relative_parts[0] if len(relative_parts) > 1 else "project"
+        app_hash = hashes.setdefault(app, hashlib.sha256())
+        app_hash.update(str(path).encode())
+        app_hash.update(path.read_bytes())
+    return {app: app_hash.hexdigest() for app, app_hash in hashes.items()}
+
+
+def _hash_po_files(context: invoke.Context) -> dict[str, str]:
+    """Hash `.po` files ignoring header updated by each makemessages."""
+    return {
+        str(path): hashlib.sha256(
+            b"".join(
+                line
+                for line in path.read_bytes().splitlines(keepends=True)
+                if not line.startswith(_POT_CREATION_DATE_PREFIX)
+            ),
+        ).hexdigest()
+        for path in _iterate_project_files(
+            context,
+            patterns=("locale/*/LC_MESSAGES/*.po",),
+        )
+    }
+
+
 @invoke.task
 def show_urls(
     context: invoke.Context,
     search: str = "",
+    name: str = "",
+    view: str = "",
+    prefix: str = "",
+    json_output: bool = False,
 ) -> None:
     """Show urls of project.
 
-    Use search param to filter urls by regex.
+    Use search param to filter urls by regex, `name`, `view` (module of view
+    or its package) and `prefix` (of url path) are looked up in index.
+
+    Urls are cached with index in `show_urls_cache_file` until `urls.py`
+    files or installed apps are changed.
 
     Not using grep to make cross-platform and also keep color output.
 
+    Requires django-extensions:
+        https://django-extensions.readthedocs.io/en/latest/installation_instructions.html
+
     """
+    url_map = _get_url_map(context)
+    if prefix:
+        prefix = f"/{prefix.lstrip('/')}"
+    route_ids = list(range(len(url_map["routes"])))
+    for index_name, key in (
+        ("name", name),
+        ("view", view),
+        ("prefix", _get_url_prefix_key(prefix)),
+    ):
+        if key:
+            indexed_ids = set(url_map["index"][index_name].get(key, ()))
+            route_ids = [
+                route_id for route_id in route_ids if route_id in indexed_ids
+            ]
+    routes = [
+        route
+        for route in map(url_map["routes"].__getitem__, route_ids)
+        if route["url"].startswith(prefix)
+        and (
+            not search
+            or re.search(
+                search,
+                f"{route['url']}\t{route['module']}\t{route['name']}",
+            )
+        )
+    ]
+    if json_output:
+        sys.stdout.write(json.dumps(routes, indent=2) + "\n")
+        return
     console = rich.console.Console()
-    for url_info in manage(
-        context,
-        command="show_urls",
-        hide=True,
-    ).stdout.splitlines():
-        if search and not re.search(search, url_info):
-            continue
-        url_parts = url_info.split()
+    for route in routes:
         console.print(
             rich.text.Text.assemble(
-                url_parts[0],
+                route["url"],
                 " ",
-                url_parts[1],
+                route["module"],
                 " ",
-                url_parts[2],
+                route["name"],
             ),
         )
 
 
+def _get_url_map(context: invoke.Context) -> dict[str, typing.Any]:
+    """Get urls of project with index from cache or from `show_urls`."""
+    config = _config.Config.from_context(context)
+    cache_path = pathlib.Path(config.django.show_urls_cache_file)
+    key = _get_url_map_key(context)
+    if cache_path.exists():
+        url_map = json.loads(cache_path.read_text())
+        if url_map["key"] == key:
+            return url_map
+    printing.print_success("Loading urls of project")
+    command = "show_urls --format=json"
+    wait_for_database(context)
+    if _is_command_server_running(context):
+        output = _run_command_via_server(context, command, hide=True).stdout
+    else:
+        result = _run_django_python(
+            context,
+            command=f"{config.django.manage_file_path} {command}",
+            hide="out",
+        )
+        output = result.stdout if result else ""
+    routes = [
+        {
+            "url": route["url"],
+            "module": route["module"],
+            "name": route.get("name") or "",
+        }
+        for route in json.loads(output[output.index("[") :])
+    ]
+    index: dict[str, dict[str, list[int]]] = {
+        "name": collections.defaultdict(list),
+        "view": collections.defaultdict(list),
+        "prefix": collections.defaultdict(list),
+    }
+    for route_id, route in enumerate(routes):
+        if route["name"]:
+            index["name"][route["name"]].append(route_id)
+        module_parts = route["module"].split(".")
+        for depth in range(1, len(module_parts) + 1):
+            index["view"][".".join(module_parts[:depth])].append(route_id)
+        index["prefix"][_get_url_prefix_key(route["url"])].append(route_id)
+    url_map = {"key": key, "routes": routes, "index": index}
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps(url_map))
+    return url_map
+
+
+def _get_url_map_key(context: invoke.Context) -> str:
+    """Get hash of `urls.py` files and installed apps of project."""
+    config = _config.Config.from_context(context)
+    key = hashlib.sha256(config.django.settings_path.encode())
+    for path in _iterate_project_files(
+        context,
+        patterns=config.django.urls_patterns,
+    ):
+        key.update(str(path).encode())
+        key.update(path.read_bytes())
+    # Settings could be not loadable outside of docker (or with missing env
+    # variables), then only files are hashed
+    try:
+        installed_apps = load_django_settings(context).INSTALLED_APPS
+    except Exception:  # noqa: BLE001
+        return key.hexdigest()
+    key.update("\n".join(installed_apps).encode())
+    return key.hexdigest()
+
+
+def _get_url_prefix_key(url: str) -> str:
+    """Get first segment of url path which is used in index."""
+    return url.lstrip("/").split("/", 1)[0]
+
+
 def set_default_site(context: invoke.Context) -> None:
     """Set default site to localhost.
 
@@ -331,12 +1042,46 @@ def set_default_site(context: invoke.Context) -> None:
 
 
 @invoke.task
-def load_db_dump(context: invoke.Context, file: str = "") -> None:
-    """Reset db and load db dump."""
+def load_db_dump(
+    context: invoke.Context,
+    file: str = "",
+    fast: bool = False,
+    jobs: int = 0,
+) -> None:
+    """Reset db and load db dump.
+
+    Dump is checked against its manifest before db is reset.
+
+    """
+    db.verify_dump_manifest(context, file=file)
     resetdb(context, apply_migrations=False)
     db.load_db_dump(
         context,
         file=file,
+        fast=fast,
+        jobs=jobs,
+        verify_manifest=False,
+        **load_django_db_settings(context),
+    )
+
+
+@invoke.task(iterable=["tables", "schemas", "sections"])
+def load_db_dump_selectively(
+    context: invoke.Context,
+    file: str = "",
+    tables: collections.abc.Sequence[str] | None = None,
+    schemas: collections.abc.Sequence[str] | None = None,
+    sections: collections.abc.Sequence[str] | None = None,
+    jobs: int = 1,
+) -> None:
+    """Load chosen tables, schemas or sections of db dump without reset."""
+    db.load_db_dump_selectively(
+        context,
+        file=file,
+        tables=tables,
+        schemas=schemas,
+        sections=sections,
+        jobs=jobs,
         **load_django_db_settings(context),
     )
 
@@ -358,9 +1103,22 @@ def backup_local_db(
 def backup_remote_db(
     context: invoke.Context,
     file: str = "",
+    jobs: int = 0,
 ) -> str:
-    """Make dump of remote db and download it."""
+    """Make dump of remote db and download it.
+
+    If `jobs` is set, db is dumped locally in directory format with `jobs`
+    parallel workers via port-forward to db pod.
+
+    """
     settings = load_django_remote_env_db_settings(context)
+    if jobs:
+        return db_k8s.create_dump_via_port_forward(
+            context,
+            file=file,
+            jobs=jobs,
+            **settings,
+        )
     db_k8s.create_dump(
         context,
         file=file,
@@ -376,10 +1134,42 @@ def backup_remote_db(
 def load_remote_db(
     context: invoke.Context,
     file: str = "",
+    jobs: int = 0,
 ) -> None:
-    """Make dump of remote db, download it and apply it."""
-    file = backup_remote_db(context, file=file)
-    load_db_dump(context, file=file)
+    """Make dump of remote db, download it and apply it.
+
+    Local db is reset while remote db is dumped and dump is loaded while it
+    arrives. If `jobs` is set, dump is made and restored with `jobs` parallel
+    workers.
+
+    """
+    db_k8s.load_dump_with_pipeline(
+        context,
+        remote_db_settings=load_django_remote_env_db_settings(context),
+        local_db_settings=load_django_db_settings(context),
+        reset_local_db=lambda: resetdb(context, apply_migrations=False),
+        file=file,
+        jobs=jobs,
+    )
+
+
+@invoke.task(iterable=["tables"])
+def sync_remote_tables(
+    context: invoke.Context,
+    tables: collections.abc.Sequence[str],
+    where: str = "",
+    disable_triggers: bool = False,
+) -> None:
+    """Stream data of tables from remote db into local db."""
+    local_settings = load_django_db_settings(context)
+    db_k8s.sync_tables(
+        context,
+        tables=tables,
+        where=where,
+        disable_triggers=disable_triggers,
+        **{f"local_{name}": value for name, value in local_settings.items()},
+        **load_django_remote_env_db_settings(context),
+    )
 
 
 def load_django_settings(context: invoke.Context):  # noqa: ANN201
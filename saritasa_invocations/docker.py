@@ -1,5 +1,6 @@
 import collections.abc
 import pathlib
+import shlex
 import shutil
 
 import invoke
@@ -76,7 +77,8 @@ def docker_compose_run(
     """
     compose_cmd = _config.Config.from_context(context).docker.compose_cmd
     env_params = " ".join(
-        f"--env {env_key}={value}" for env_key, value in (env or {}).items()
+        f"--env {shlex.quote(f'{env_key}={value}')}"
+        for env_key, value in (env or {}).items()
     )
     return context.run(
         command=(
@@ -112,6 +114,41 @@ def docker_compose_exec(
     context.run(cmd)
 
 
+def docker_exec(
+    context: invoke.Context,
+    container: str,
+    command: str,
+    params: str = "",
+    watchers: collections.abc.Sequence[invoke.StreamWatcher] = (),
+    env: dict[str, str] | None = None,
+    **kwargs,
+) -> invoke.runners.Result | None:
+    """Run ``command`` in running container.
+
+    docker exec <params> <container> <command>
+
+    Args:
+    ----
+        context: Invoke context
+        container: Name of running container
+        command: Command to run in container
+        params: Configuration params for docker exec
+        watchers: Automated responders to command
+        env: environmental variables for run
+        kwargs: additional arguments for context.run
+
+    """
+    env_params = " ".join(
+        f"--env {shlex.quote(f'{env_key}={value}')}"
+        for env_key, value in (env or {}).items()
+    )
+    return context.run(
+        command=f"docker exec {params} {env_params} {container} {command}",
+        watchers=watchers,
+        **kwargs,
+    )
+
+
 @invoke.task
 def stop_all_containers(context: invoke.Context) -> None:
     """Shortcut for stopping ALL running docker containers."""
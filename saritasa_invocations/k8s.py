@@ -2,6 +2,8 @@ import collections
 import collections.abc
 import contextlib
 import pathlib
+import socket
+import time
 import typing
 
 import invoke
@@ -262,6 +264,84 @@ def download_file_from_pod(
     )
 
 
+def upload_file_to_pod(
+    context: invoke.Context,
+    pod_namespace: str,
+    get_pod_name_command: str,
+    path_to_file: str,
+    path_to_where_save_file_in_pod: str,
+    retries: int = -1,
+) -> None:
+    """Upload file to pod."""
+    context.run(
+        "kubectl cp"
+        f" --namespace {pod_namespace}"
+        f" --retries={retries}"
+        f" {path_to_file}"
+        f" $({get_pod_name_command}):{path_to_where_save_file_in_pod}",
+    )
+
+
+@contextlib.contextmanager
+def port_forward(
+    context: invoke.Context,
+    pod_namespace: str,
+    get_pod_name_command: str,
+    local_port: str,
+    pod_port: str,
+    timeout: float = 10.0,
+) -> collections.abc.Generator[None, None, None]:
+    """Forward local port to pod's port while in context.
+
+    Context is entered once local port accepts connections. Port-forward
+    process is killed on exit, even if body of context failed.
+
+    """
+    # `exec` replaces shell, so killing process kills kubectl itself
+    promise: invoke.runners.Promise = context.run(  # type: ignore[assignment]
+        "exec kubectl port-forward"
+        f" --namespace {pod_namespace}"
+        f" $({get_pod_name_command})"
+        f" {local_port}:{pod_port}",
+        asynchronous=True,
+        pty=False,
+    )
+    try:
+        _wait_for_local_port(promise, local_port=local_port, timeout=timeout)
+        yield
+    finally:
+        promise.runner.kill()
+        with contextlib.suppress(invoke.Failure):
+            promise.join()
+
+
+def _wait_for_local_port(
+    promise: invoke.runners.Promise,
+    local_port: str,
+    timeout: float,
+) -> None:
+    """Wait until local port accepts connections."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if promise.runner.process_is_finished:
+            # Raises error with output of failed process
+            promise.join()
+            break
+        with (
+            contextlib.suppress(OSError),
+            socket.create_connection(
+                ("127.0.0.1", int(local_port)),
+                timeout=1,
+            ),
+        ):
+            return
+        time.sleep(0.2)
+    raise invoke.Exit(
+        code=1,
+        message=f"Port-forward to {local_port} is not ready in {timeout}s",
+    )
+
+
 @invoke.task
 def download_file(
     context: invoke.Context,
@@ -1,6 +1,6 @@
 import invoke
 
-from . import _config, docker, printing, python
+from . import _config, django, docker, printing, python
 
 
 @invoke.task
@@ -8,9 +8,22 @@ def run(
     context: invoke.Context,
     path: str = ".",
     params: str = "",
+    workers: int = 0,
+    clone_test_db: bool = False,
 ) -> None:
-    """Run pytest in `path` with `params`."""
+    """Run pytest in `path` with `params`.
+
+    If `workers` is set, tests are run by pytest-xdist workers. If
+    `clone_test_db` is set, django test databases are cloned from template
+    built from migrations (see `django.prepare_test_databases`) and reused.
+
+    """
     docker.up(context)
+    if clone_test_db:
+        django.prepare_test_databases(context, workers=workers)
+        params = f"--reuse-db {params}"
+    if workers:
+        params = f"--numprocesses={workers} {params}"
     printing.print_success("Running PyTest")
     pytest_entry = _config.Config.from_context(context).python.pytest_entry
     python.run(context, f"{pytest_entry} {path} {params}")
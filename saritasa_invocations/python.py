@@ -1,10 +1,12 @@
 import collections.abc
 import enum
 import os
+import sys
+import time
 
 import invoke
 
-from . import _config, docker
+from . import _config, docker, printing
 
 
 class StrEnum(str, enum.Enum):
@@ -41,8 +43,25 @@ def run_docker(
     env: dict[str, str] | None = None,
     **kwargs,
 ) -> invoke.runners.Result | None:
-    """Run command in `python` container."""
+    """Run command in `python` container.
+
+    If `reuse_docker_service` is set and no custom `params` are passed
+    (`None` or empty), command is run in long-lived service container via
+    `docker exec` instead of creating new container.
+
+    """
     config = _config.Config.from_context(context)
+    if not params and config.python.reuse_docker_service:
+        return docker.docker_exec(
+            context,
+            container=start_docker_service_container(context),
+            # Allocate tty only when it's present, like `docker compose run`
+            params="--interactive --tty" if sys.stdin.isatty() else "",
+            command=command,
+            watchers=watchers,
+            env=env,
+            **kwargs,
+        )
     if params is None:
         params = config.python.docker_service_params
     return docker.docker_compose_run(
@@ -56,6 +75,132 @@ def run_docker(
     )
 
 
+def start_docker_service_container(context: invoke.Context) -> str:
+    """Start long-lived container of `python` service unless it's running.
+
+    Container is recreated if it's stopped, unhealthy or image of service
+    has changed (for example, after rebuild). Container is checked once per
+    invocation. Returns name of container.
+
+    """
+    config = _config.Config.from_context(context)
+    name = config.python.docker_service_container_name.format(
+        project_name=config.project_name,
+        service=config.python.docker_service,
+    )
+    if getattr(start_docker_service_container, "_checked", "") == name:
+        return name
+    state = _get_container_state(context, name)
+    if state is not None and state["image"] == _get_service_image_id(context):
+        state = _wait_for_container_health(context, name, state)
+        if state is not None and state["health"] != "unhealthy":
+            start_docker_service_container._checked = name  # type: ignore
+            return name
+    if state is not None:
+        printing.print_warn(f"Recreating {name} container")
+        context.run(f"docker rm --force {name}", hide="out")
+    printing.print_success(f"Starting {name} container")
+    docker.docker_compose_run(
+        context,
+        container=config.python.docker_service,
+        params=(
+            f"{config.python.docker_service_container_params} --name {name}"
+        ),
+        command=config.python.docker_service_container_command,
+        hide="out",
+    )
+    state = _wait_for_container_health(
+        context,
+        name,
+        _get_container_state(context, name),
+    )
+    if state is None or state["health"] == "unhealthy":
+        raise invoke.Exit(
+            code=1,
+            message=f"{name} container is not healthy",
+        )
+    start_docker_service_container._checked = name  # type: ignore
+    return name
+
+
+@invoke.task
+def stop_docker_service_container(context: invoke.Context) -> None:
+    """Stop and remove long-lived container of `python` service."""
+    config = _config.Config.from_context(context)
+    name = config.python.docker_service_container_name.format(
+        project_name=config.project_name,
+        service=config.python.docker_service,
+    )
+    printing.print_success(f"Removing {name} container")
+    context.run(f"docker rm --force {name}", warn=True)
+
+
+def _get_container_state(
+    context: invoke.Context,
+    name: str,
+) -> dict[str, str] | None:
+    """Get image and health of running container.
+
+    Health is empty if container has no healthcheck. None is returned if
+    container doesn't exist or is not running.
+
+    """
+    result = context.run(
+        "docker inspect --format "
+        "'{{.Image}} {{.State.Running}} "
+        "{{if .State.Health}}{{.State.Health.Status}}{{end}}' "
+        f"{name}",
+        hide=True,
+        warn=True,
+        echo=False,
+    )
+    if not result or result.failed:
+        return None
+    image, running, *health = result.stdout.split()
+    if running != "true":
+        return None
+    return {"image": image, "health": "".join(health)}
+
+
+def _get_service_image_id(context: invoke.Context) -> str:
+    """Get id of current image of `python` service."""
+    config = _config.Config.from_context(context)
+    result = context.run(
+        f"{config.docker.compose_cmd} config --images "
+        f"{config.python.docker_service}",
+        hide=True,
+        echo=False,
+    )
+    image = result.stdout.split()[0] if result else ""
+    result = context.run(
+        f"docker image inspect --format '{{{{.Id}}}}' {image}",
+        hide=True,
+        warn=True,
+        echo=False,
+    )
+    return result.stdout.strip() if result and result.ok else ""
+
+
+def _wait_for_container_health(
+    context: invoke.Context,
+    name: str,
+    state: dict[str, str] | None,
+) -> dict[str, str] | None:
+    """Wait while healthcheck of container is starting."""
+    config = _config.Config.from_context(context)
+    deadline = (
+        time.monotonic() + config.python.docker_service_container_timeout
+    )
+    while (
+        state is not None
+        and state["health"] == "starting"
+        and time.monotonic() < deadline
+    ):
+        time.sleep(0.5)
+        state = _get_container_state(context, name)
+    return state
+
+
 def run_docker_python(
     context: invoke.Context,
     command: str,
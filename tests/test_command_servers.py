@@ -0,0 +1,39 @@
+import typing
+
+import pytest
+
+from saritasa_invocations import (
+    _alembic_command_server,
+    _django_command_server,
+    _django_profiler,
+)
+
+SCRIPTS = (_alembic_command_server, _django_command_server, _django_profiler)
+
+
+@pytest.mark.parametrize("script", SCRIPTS)
+@pytest.mark.parametrize(
+    ["code", "exit_code"],
+    [
+        [None, 0],
+        [0, 0],
+        [2, 2],
+    ],
+)
+def test_exit_code_of_system_exit(
+    script: typing.Any,
+    code: int | None,
+    exit_code: int,
+) -> None:
+    """Ensure that `SystemExit` is mapped to exit code like by interpreter."""
+    assert script._get_exit_code(SystemExit(code)) == exit_code
+
+
+@pytest.mark.parametrize("script", SCRIPTS)
+def test_message_of_system_exit(
+    script: typing.Any,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """Ensure that message of `SystemExit` is printed to stderr."""
+    assert script._get_exit_code(SystemExit("Error")) == 1
+    assert capsys.readouterr().err == "Error\n"
@@ -0,0 +1,93 @@
+import pathlib
+
+import invoke
+import pytest
+
+import saritasa_invocations
+from saritasa_invocations import db
+
+DB_SETTINGS = {
+    "dbname": "project",
+    "host": "localhost",
+    "port": "5432",
+    "username": "postgres",
+    "password": "",
+}
+
+
+@pytest.fixture
+def context(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> invoke.Context:
+    """Prepare context with db commands which write fake dumps."""
+    monkeypatch.chdir(tmp_path)
+    return invoke.Context(
+        invoke.Config(
+            overrides={
+                "run": {"hide": True, "in_stream": False},
+                "saritasa_invocations": saritasa_invocations.Config(
+                    db=saritasa_invocations.DBSettings(
+                        credentials_mode="env",
+                        dump_command="echo {additional_params} > {file}",
+                        subset_command="echo data > {file}",
+                    ),
+                ),
+            },
+        ),
+    )
+
+
+def test_subset_dump_replaces_manifest_of_previous_dump(
+    context: invoke.Context,
+) -> None:
+    """Ensure that subset dump isn't checked against manifest of old dump."""
+    db.backup_local_db(context, **DB_SETTINGS)
+    db.backup_local_db_subset(
+        context,
+        root_tables=["orders"],
+        **DB_SETTINGS,
+    )
+    db.verify_dump_manifest(context)
+
+
+def test_failed_dump_removes_manifest_of_previous_dump(
+    context: invoke.Context,
+) -> None:
+    """Ensure that failed dump doesn't leave manifest of previous dump."""
+    db.backup_local_db(context, **DB_SETTINGS)
+    context.config.saritasa_invocations.db.subset_command = "exit 1"
+    with pytest.raises(invoke.UnexpectedExit):
+        db.backup_local_db_subset(
+            context,
+            root_tables=["orders"],
+            **DB_SETTINGS,
+        )
+    assert not pathlib.Path("local-db-dump.sql.manifest.json").exists()
+
+
+TABLE_SIZES_OUTPUT = """\
+public.audit|3000|3 kB|f
+public.big|2000|2 kB|t
+public.orders|1000|1 kB|f
+"""
+
+
+def test_table_sizes_report_matches_exclude_params() -> None:
+    """Ensure that report and params exclude the same tables."""
+    table_sizes = db.get_table_sizes(TABLE_SIZES_OUTPUT, patterns=["audit"])
+    assert db.print_table_sizes_report(table_sizes) == (1000, 5000)
+    assert db.generate_exclude_table_data_params(
+        TABLE_SIZES_OUTPUT,
+        patterns=["audit"],
+    ) == [
+        "--exclude-table-data=public.audit",
+        "--exclude-table-data=public.big",
+    ]
+
+
+def test_load_missing_dump(context: invoke.Context) -> None:
+    """Ensure that missing dump is reported without traceback."""
+    with pytest.raises(invoke.Exit) as error:
+        db.load_db_dump(context, file="missing.sql", **DB_SETTINGS)
+    assert error.value.message == "missing.sql not found"
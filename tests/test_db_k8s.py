@@ -0,0 +1,16 @@
+import invoke
+import pytest
+
+from saritasa_invocations import db_k8s
+
+
+@pytest.mark.parametrize("credentials_mode", ["prompt", "env"])
+def test_db_pod_password_is_passed_via_stdin(credentials_mode: str) -> None:
+    """Ensure that password isn't exposed in command line of kubectl."""
+    with db_k8s._get_db_pod_credentials(
+        invoke.Context(),
+        password="secret",
+        credentials_mode=credentials_mode,
+    ) as (credentials_command, credentials_kwargs):
+        assert "secret" not in credentials_command
+        assert credentials_kwargs["in_stream"].read() == "secret\n"
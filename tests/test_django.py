@@ -0,0 +1,141 @@
+import pathlib
+
+import invoke
+import pytest
+
+import saritasa_invocations
+from saritasa_invocations import django, docker, python
+
+
+class ImproperlyConfiguredError(Exception):
+    """Error of django settings which invoke doesn't know about."""
+
+
+@pytest.fixture
+def context(
+    tmp_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> invoke.Context:
+    """Prepare context with no ready database marker."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delattr(django.wait_for_database, "_called", raising=False)
+    return invoke.Context(
+        invoke.Config(
+            overrides={
+                "saritasa_invocations": saritasa_invocations.Config(
+                    project_name="project",
+                ),
+            },
+        ),
+    )
+
+
+def test_wait_for_database_falls_back_on_settings_error(
+    context: invoke.Context,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Ensure that any error of settings falls back to management command."""
+    calls = []
+
+    def load_django_db_settings(context: invoke.Context) -> dict[str, str]:
+        raise ImproperlyConfiguredError
+
+    monkeypatch.setattr(docker, "up", lambda context: None)
+    monkeypatch.setattr(
+        django,
+        "load_django_db_settings",
+        load_django_db_settings,
+    )
+    monkeypatch.setattr(
+        python,
+        "run",
+        lambda context, command, env: calls.append(command),
+    )
+    django.wait_for_database(context)
+    assert calls == ["./manage.py wait_for_database --stable 0"]
+
+
+def test_makemigrations_isnt_sent_to_command_server(
+    context: invoke.Context,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Ensure that `makemigrations` sees models changed after server start."""
+    calls = []
+    monkeypatch.setattr(django, "wait_for_database", lambda context: None)
+    monkeypatch.setattr(
+        django,
+        "_is_command_server_running",
+        lambda context: True,
+    )
+    monkeypatch.setattr(
+        python,
+        "run",
+        lambda context, command, **kwargs: calls.append(command),
+    )
+    django.manage(context, command="makemigrations --check")
+    assert calls == ["./manage.py makemigrations --check"]
+
+
+def test_compile_messages_doesnt_read_stdin(
+    context: invoke.Context,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Ensure that concurrent compilemessages don't race on stdin."""
+    in_streams = []
+    monkeypatch.setattr(django, "wait_for_database", lambda context: None)
+    monkeypatch.setattr(
+        django,
+        "manage",
+        lambda context, command: in_streams.append(
+            context.config.run.in_stream,
+        ),
+    )
+    django._compile_messages(context, locales=["de", "fr"])
+    assert in_streams == [False, False]
+    assert context.config.run.in_stream is None
+
+
+def test_command_server_isnt_started_in_docker_env(
+    context: invoke.Context,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Ensure that composite tasks don't wait for unreachable server."""
+    monkeypatch.setenv("PYTHON_ENV", python.PythonEnv.DOCKER.value)
+    monkeypatch.setattr(
+        django,
+        "_run_command_server",
+        lambda context, **kwargs: pytest.fail("Server is started"),
+    )
+    with django.running_command_server(context):
+        pass
+
+
+def test_recompile_messages_without_changes_doesnt_start_django(
+    context: invoke.Context,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Ensure that nothing is started if sources and messages are same."""
+    monkeypatch.setattr(
+        django,
+        "running_command_server",
+        lambda context: pytest.fail("Command server is started"),
+    )
+    monkeypatch.setattr(
+        django,
+        "manage",
+        lambda context, command: pytest.fail(f"{command} is run"),
+    )
+    django.recompile_messages(context)
+
+
+def test_url_map_key_ignores_settings_error(
+    context: invoke.Context,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Ensure that urls are cached by files if settings can't be loaded."""
+
+    def load_django_settings(context: invoke.Context) -> None:
+        raise ImproperlyConfiguredError
+
+    monkeypatch.setattr(django, "load_django_settings", load_django_settings)
+    assert django._get_url_map_key(context)
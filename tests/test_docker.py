@@ -0,0 +1,19 @@
+import invoke
+
+from saritasa_invocations import docker
+
+
+def test_docker_exec_quotes_env() -> None:
+    """Ensure that env values are passed to container as is."""
+    context = invoke.MockContext(run=invoke.Result())
+    docker.docker_exec(
+        context,
+        container="project-web-python",
+        command="env",
+        env={"MESSAGE": "hello world; $HOME"},
+    )
+    context.run.assert_called_once()
+    assert (
+        "--env 'MESSAGE=hello world; $HOME'"
+        in context.run.call_args.kwargs["command"]
+    )
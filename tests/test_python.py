@@ -0,0 +1,80 @@
+import invoke
+import pytest
+
+import saritasa_invocations
+from saritasa_invocations import django, docker, python
+
+
+@pytest.fixture
+def context(monkeypatch: pytest.MonkeyPatch) -> invoke.Context:
+    """Prepare context for docker env with reused service container."""
+    monkeypatch.setenv("PYTHON_ENV", python.PythonEnv.DOCKER.value)
+    return invoke.Context(
+        invoke.Config(
+            overrides={
+                "saritasa_invocations": saritasa_invocations.Config(
+                    project_name="project",
+                    python=saritasa_invocations.PythonSettings(
+                        reuse_docker_service=True,
+                    ),
+                ),
+            },
+        ),
+    )
+
+
+def test_manage_reuses_docker_service_container(
+    context: invoke.Context,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Ensure that `manage` without docker params uses `docker exec`."""
+    calls = []
+    monkeypatch.setattr(django, "wait_for_database", lambda context: None)
+    monkeypatch.setattr(
+        django,
+        "_is_command_server_running",
+        lambda context: False,
+    )
+    monkeypatch.setattr(
+        python,
+        "start_docker_service_container",
+        lambda context: "project-web-python",
+    )
+    monkeypatch.setattr(
+        docker,
+        "docker_exec",
+        lambda context, **kwargs: calls.append(kwargs),
+    )
+    monkeypatch.setattr(
+        docker,
+        "docker_compose_run",
+        lambda context, **kwargs: pytest.fail("Container is not reused"),
+    )
+
+    django.manage(context, command="check")
+
+    assert len(calls) == 1
+    assert calls[0]["container"] == "project-web-python"
+    assert calls[0]["command"] == "python ./manage.py check"
+
+
+def test_docker_params_skip_service_container(
+    context: invoke.Context,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Ensure that custom docker params are passed to `docker compose run`."""
+    calls = []
+    monkeypatch.setattr(
+        docker,
+        "docker_exec",
+        lambda context, **kwargs: pytest.fail("Container is reused"),
+    )
+    monkeypatch.setattr(
+        docker,
+        "docker_compose_run",
+        lambda context, **kwargs: calls.append(kwargs),
+    )
+
+    python.run_docker(context, command="python", params="--service-ports")
+
+    assert calls[0]["params"] == "--service-ports"